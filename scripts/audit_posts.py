@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""Audit blog posts for publishing consistency.
+
+Applies the rules of audit_posts.ps1 without needing PowerShell, with the
+same issues and summary; a main.png cover must be WIDTHxHEIGHT as rendered
+by cover_creative.py. Front matter is read by streaming the block between the
+--- markers; --front-matter-only stops there and skips the body rules.
+
+Posts are audited on a thread pool, and results are cached by the size and
+mtime of each post and every file it references, so a repeat audit of an
+unchanged tree only stats files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from cover_creative import HEIGHT, WIDTH, default_cache_dir, git_changed_posts
+
+ROOT = Path(__file__).resolve().parent.parent
+REQUIRED_FIELDS = ('title', 'published', 'description', 'tags', 'cover_image', 'canonical_url', 'id', 'series', 'date')
+SKIPPED_FILES = ('README.md', 'example_README.md')
+PLACEHOLDERS = ('TODO:', 'YYYY', 'DD-MM-YYYY')
+MAX_DESCRIPTION = 150
+MAX_TAGS = 4
+# The summary counts the same categories as audit_posts.ps1; the others are only listed per post.
+CATEGORIES = {
+    'FM': 'Front Matter',
+    'FOOTER': 'Footer',
+    'NAMING': 'Naming',
+    'STYLE': 'Style',
+}
+CACHE_NAME = 'audit-posts.json'
+
+# PowerShell's -match is case-insensitive, so the rules are too.
+NOCASE = re.IGNORECASE
+NOCASE_LINES = re.IGNORECASE | re.MULTILINE
+
+
+@dataclass(frozen=True)
+class PostAudit:
+    path: str
+    issues: tuple[str, ...]
+    depends_on: tuple[str, ...] = ()
+
+
+def read_post(path: Path, front_matter_only: bool) -> tuple[str | None, str]:
+    """Return a post's front matter block (None when it has none) and, unless skipped, its body."""
+    with path.open(encoding='utf-8-sig') as handle:
+        first = handle.readline()
+        if first.rstrip('\n') != '---':
+            return None, '' if front_matter_only else first + handle.read()
+        lines = []
+        for line in handle:
+            if line.rstrip('\n') == '---':
+                return ''.join(lines).rstrip('\n'), '' if front_matter_only else handle.read()
+            lines.append(line)
+    return None, '' if front_matter_only else first + ''.join(lines)
+
+
+def png_size(path: Path) -> tuple[int, int] | None:
+    """Read a PNG's dimensions from its header, or None when the file is not a PNG."""
+    with path.open('rb') as handle:
+        header = handle.read(24)
+    if len(header) < 24 or header[:8] != b'\x89PNG\r\n\x1a\n':
+        return None
+    return int.from_bytes(header[16:20], 'big'), int.from_bytes(header[20:24], 'big')
+
+
+def front_matter_issues(fm: str) -> list[str]:
+    issues = []
+    for field in REQUIRED_FIELDS:
+        if not re.search(rf'^{field}:\s*', fm, NOCASE_LINES):
+            issues.append(f'FM: missing {field} field')
+
+    match = re.search(r"description:\s*'([^']*)'", fm, NOCASE) or re.search(r'description:\s*"([^"]*)"', fm, NOCASE)
+    if match:
+        description = match.group(1)
+    else:
+        match = re.search(r'description:\s+([^\r\n]+)', fm, NOCASE)
+        description = match.group(1).strip().strip('\'"') if match else ''
+    if len(description) > MAX_DESCRIPTION:
+        issues.append(f'FM: description too long ({len(description)} chars, max {MAX_DESCRIPTION})')
+    if not re.search(r"^description:\s*'[^']*'$", fm, NOCASE_LINES):
+        issues.append('FM: description not single-quoted')
+
+    if not re.search(r'^published:\s*(true|false)$', fm, NOCASE_LINES):
+        issues.append('FM: published must be true or false')
+    match = re.search(r"^date:\s*'([^']+)'", fm, NOCASE_LINES)
+    if match and not re.search(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$', match.group(1), NOCASE):
+        issues.append('FM: date is not ISO 8601 UTC')
+
+    if re.search(r'cover_image:.*refs/heads/main', fm, NOCASE):
+        issues.append('FM: cover_image uses refs/heads/main variant (should use /main/posts/...)')
+    if not re.search(r'cover_image:', fm, NOCASE):
+        issues.append('FM: cover_image field missing')
+    match = re.search(r'''cover_image:.*?/assets/([^'"\s]+)''', fm, NOCASE)
+    if match:
+        cover_file = match.group(1).rstrip('\'"')
+        if cover_file != 'main.png':
+            issues.append(f"FM: cover filename is '{cover_file}' (convention: main.png)")
+
+    match = re.search(r"tags:\s*'([^']*)'", fm, NOCASE)
+    if match and len(match.group(1).split(',')) > MAX_TAGS:
+        issues.append(f'FM: too many tags ({len(match.group(1).split(","))}, max {MAX_TAGS})')
+    match = re.search(r"^tags:\s*'([^']*)'", fm, NOCASE_LINES)
+    if match and not [tag for tag in match.group(1).split(',') if tag.strip()]:
+        issues.append('FM: tags must contain at least one tag')
+    return issues
+
+
+def cover_issues(fm: str, post: Path, depends_on: list[Path]) -> list[str]:
+    match = re.search(r"cover_image:\s*'([^']+)'", fm, NOCASE)
+    if not match:
+        return []
+    match = re.search(r'/assets/([^/]+)$', match.group(1), NOCASE)
+    if not match:
+        return []
+    name = match.group(1)
+    cover = post.parent / 'assets' / name
+    depends_on.append(cover)
+    if not cover.exists():
+        return [f'ASSET: cover file does not exist: {name}']
+    if name.lower() != 'main.png':
+        return []
+    try:
+        size = png_size(cover)
+    except OSError:
+        size = None
+    if size is None:
+        return ['ASSET: could not inspect PNG cover dimensions']
+    if size != (WIDTH, HEIGHT):
+        return [f'ASSET: main.png is {size[0]}x{size[1]}, expected {WIDTH}x{HEIGHT}']
+    return []
+
+
+def content_issues(content: str, post: Path, depends_on: list[Path]) -> list[str]:
+    """Flag leftover placeholders and missing local images; ``content`` includes the front matter, like the PowerShell audit."""
+    issues = []
+    for placeholder in PLACEHOLDERS:
+        if re.search(re.escape(placeholder), content, NOCASE):
+            issues.append(f'CONTENT: placeholder remains: {placeholder}')
+
+    for match in re.finditer(r'!\[[^]]*\]\(([^)]+)\)', content):
+        reference = match.group(1)
+        if not re.match(r'https?://', reference, NOCASE):
+            image = post.parent / reference
+            depends_on.append(image)
+            if not image.exists():
+                issues.append(f'LINK: image does not exist: {reference}')
+    return issues
+
+
+def footer_issues(content: str, body: str) -> list[str]:
+    issues = []
+    if re.search(r'linkedin\.com/in/marcel-l-61b0a96b', content, NOCASE):
+        issues.append('FOOTER: old LinkedIn URL /in/marcel-l-61b0a96b/ (should be /in/marcel-pwd9000/)')
+    if re.search(r'linkedin\.com/in/marcel-pwd9000//', content, NOCASE):
+        issues.append('FOOTER: double trailing slash in LinkedIn URL')
+    if not re.search(r'\{%\s*user\s+pwd9000\s*%\}', content, NOCASE):
+        issues.append('FOOTER: missing {% user pwd9000 %} tag')
+    if not re.search(r':octopus:\s*\[GitHub\].*:penguin:\s*\[X\].*:space_invader:\s*\[LinkedIn\]', content, NOCASE):
+        issues.append('FOOTER: social links block is missing or incomplete')
+
+    if not re.search(r'Date:\s*(\d{2}-\d{2}-\d{4})', content, NOCASE):
+        if re.search(r'Date:', content, NOCASE):
+            issues.append('FOOTER: Date line must use DD-MM-YYYY')
+        else:
+            issues.append('FOOTER: missing Date line')
+
+    if '—' in body:
+        issues.append('STYLE: contains emdash character (use full stop or comma instead)')
+    if not re.search(r'https?://', body, NOCASE):
+        issues.append('SOURCES: no external reference URL found')
+    return issues
+
+
+def audit_post(post: Path, front_matter_only: bool = False) -> PostAudit:
+    """Audit one post and list the files its result depends on besides the post itself."""
+    fm, body = read_post(post, front_matter_only)
+    depends_on: list[Path] = []
+    issues = []
+    if fm is not None:
+        issues += front_matter_issues(fm)
+    else:
+        issues.append('FM: no front matter found')
+    issues += cover_issues(fm or '', post, depends_on)
+
+    content = body if fm is None else f'---\n{fm}\n---\n{body}'
+    if not front_matter_only:
+        issues += content_issues(content, post, depends_on)
+    if post.stem != post.parent.name and post.stem != 'index':
+        issues.append(f"NAMING: filename '{post.name}' does not match folder '{post.parent.name}'")
+    if not front_matter_only:
+        issues += footer_issues(content, body)
+    return PostAudit(relative_path(post), tuple(issues), tuple(str(path) for path in depends_on))
+
+
+def relative_path(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def find_posts(paths: list[Path]) -> list[Path]:
+    """Return the requested Markdown files, or every post under posts/ like the PowerShell audit."""
+    if paths:
+        return sorted(path for path in paths if path.suffix == '.md')
+    return sorted(
+        path
+        for path in (ROOT / 'posts').rglob('*.md')
+        if 'code' not in (part.lower() for part in path.relative_to(ROOT).parts[:-1]) and path.name not in SKIPPED_FILES
+    )
+
+
+def _stat(path: str) -> list[int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class AuditCache:
+    """Audit results keyed by post, valid while the post and every file it references are unchanged."""
+
+    def __init__(self, path: Path, front_matter_only: bool) -> None:
+        self.path = path
+        rules = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+        self.version = f'{rules}:{WIDTH}x{HEIGHT}:{int(front_matter_only)}'
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            data = {}
+        self.entries = data.get('posts', {}) if data.get('version') == self.version else {}
+        self.dirty = False
+
+    def get(self, post: Path) -> PostAudit | None:
+        entry = self.entries.get(str(post.resolve()))
+        if entry is None or entry['stat'] != _stat(str(post)):
+            return None
+        if any(_stat(path) != stat for path, stat in entry['depends_on'].items()):
+            return None
+        return PostAudit(entry['path'], tuple(entry['issues']), tuple(entry['depends_on']))
+
+    def put(self, post: Path, audit: PostAudit) -> None:
+        self.entries[str(post.resolve())] = {
+            'path': audit.path,
+            'stat': _stat(str(post)),
+            'issues': list(audit.issues),
+            'depends_on': {path: _stat(path) for path in audit.depends_on},
+        }
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+            temp_path.write_text(json.dumps({'version': self.version, 'posts': self.entries}), encoding='utf-8')
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+
+def audit_posts(posts: list[Path], workers: int, front_matter_only: bool, cache: AuditCache | None) -> list[PostAudit]:
+    """Audit ``posts`` on a thread pool, reusing cached results for unchanged posts."""
+    audits: dict[Path, PostAudit] = {}
+    pending = []
+    for post in posts:
+        cached = cache.get(post) if cache is not None else None
+        if cached is not None:
+            audits[post] = cached
+        else:
+            pending.append(post)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for post, audit in zip(pending, pool.map(lambda post: audit_post(post, front_matter_only), pending)):
+            audits[post] = audit
+            if cache is not None:
+                cache.put(post, audit)
+    if cache is not None:
+        cache.save()
+    return [audits[post] for post in posts]
+
+
+def print_report(scanned: int, results: list[PostAudit]) -> None:
+    total = sum(len(result.issues) for result in results)
+    print('\n=========================================')
+    print('  BLOG POST AUDIT REPORT')
+    print(f'  Total posts scanned: {scanned}')
+    print(f'  Posts with issues: {len(results)}')
+    print(f'  Total issues: {total}')
+    print('=========================================\n')
+
+    for result in results:
+        print(f'--- {result.path} ({len(result.issues)} issue(s)) ---')
+        for issue in result.issues:
+            print(f'  - {issue}')
+        print()
+
+    counts = {prefix: 0 for prefix in CATEGORIES}
+    for result in results:
+        for issue in result.issues:
+            prefix = issue.partition(':')[0]
+            if prefix in counts:
+                counts[prefix] += 1
+    print('=========================================')
+    print('  SUMMARY BY CATEGORY')
+    for prefix, label in CATEGORIES.items():
+        print(f'  {label + ":":<14} {counts[prefix]}')
+    print('=========================================')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Audit new or explicitly selected blog posts for publishing consistency')
+    parser.add_argument('paths', type=Path, nargs='*', help='Posts to audit. Defaults to every post under posts/.')
+    parser.add_argument('--changed-only', action='store_true', help='Only audit posts git diff reports as changed')
+    parser.add_argument(
+        '--base-ref',
+        default='HEAD',
+        help='Git ref for --changed-only: HEAD compares the working tree, other refs compare REF...HEAD. Defaults to HEAD.',
+    )
+    parser.add_argument('--fail-on-issues', action='store_true', help='Exit with status 1 when any post has issues')
+    parser.add_argument(
+        '--front-matter-only',
+        action='store_true',
+        help='Read only the front matter block and skip the content, link, footer, style and source rules',
+    )
+    parser.add_argument('--workers', type=int, default=min(32, (os.cpu_count() or 1) + 4), help='Audit threads')
+    parser.add_argument('--no-cache', action='store_true', help='Audit every post again instead of reusing cached results')
+    args = parser.parse_args()
+
+    missing = [str(path) for path in args.paths if not path.is_file()]
+    if missing:
+        parser.error(f'No such file: {", ".join(missing)}')
+    posts = find_posts(args.paths)
+    if args.changed_only:
+        try:
+            changed = git_changed_posts(ROOT / 'posts', args.base_ref)
+        except (OSError, subprocess.CalledProcessError) as exc:
+            parser.error(f'--changed-only could not ask git for changed posts: {exc}')
+        posts = [post for post in posts if post.resolve() in changed]
+
+    cache = None if args.no_cache else AuditCache(default_cache_dir() / CACHE_NAME, args.front_matter_only)
+    audits = audit_posts(posts, args.workers, args.front_matter_only, cache)
+    results = [audit for audit in audits if audit.issues]
+    print_report(len(posts), results)
+    if args.fail_on_issues and results:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""Benchmark cover_creative.py styles and guard their output.
+
+Every style renders a matrix of titles (short, long, wrapping onto several
+lines) and seeds in its own process, and the run reports wall time, peak RSS
+and output bytes per style. Each case is rendered several times and must hash
+identically every time, so a fixed --seed stays repeatable.
+
+Save a run with --save-baseline and compare later runs with --baseline; the
+script exits non-zero when a style gets slower, heavier or larger than the
+thresholds allow, or when a case no longer renders the same pixels. Baselines
+depend on the machine and installed fonts, so keep them local.
+
+--smoke instead runs the cover_creative.py command line end to end for
+every output kind (still formats, stdout and each animation format) and
+checks what it wrote.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import cover_creative as cc
+from PIL import Image
+
+TITLES = {
+    'short': ('Ship it', ''),
+    'long': (
+        'Benchmarking every cover style before optimizing the render path',
+        'Wall time, peak memory and bytes per style',
+    ),
+    'multi-line': (
+        'A deliberately long cover title that has to wrap onto several lines and may even shrink to fit the canvas',
+        'Subtitles wrap too when a description runs long enough to need a second line',
+    ),
+}
+DEFAULT_SEEDS = (1, 2, 3)
+DEFAULT_REPEAT = 3
+BASELINE_VERSION = 1
+# --smoke outputs with the format and frame count each must hold; '-' is stdout.
+SMOKE_CASES = (
+    ('cover.png', 'PNG', 1),
+    ('cover.jpg', 'JPEG', 1),
+    ('cover.webp', 'WEBP', 1),
+    ('-', 'PNG', 1),
+    ('anim.gif', 'GIF', 3),
+    ('anim.apng', 'PNG', 3),
+    ('anim.webp', 'WEBP', 3),
+)
+
+
+def peak_rss_bytes() -> int | None:
+    """Return this process's peak resident set size, or None where it cannot be read."""
+    if os.name == 'nt':
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ('cb', wintypes.DWORD),
+                ('PageFaultCount', wintypes.DWORD),
+                ('PeakWorkingSetSize', ctypes.c_size_t),
+                ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t),
+                ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def pixel_hash(path: Path) -> str:
+    """Hash decoded pixels, so the check does not depend on encoder settings."""
+    with Image.open(path) as img:
+        img.load()
+        digest = hashlib.sha256(f'{img.mode}:{img.width}x{img.height}:'.encode('ascii'))
+        digest.update(img.tobytes())
+    return digest.hexdigest()
+
+
+def bench_style(style: str, seeds: tuple[int, ...], repeat: int, options: cc.RenderOptions) -> dict:
+    """Render every title and seed for ``style`` ``repeat`` times; runs in a fresh process."""
+    cases = []
+    with tempfile.TemporaryDirectory(prefix='bench-covers-') as folder:
+        output = Path(folder) / 'cover.png'
+        # Warm fonts and layout caches once, as a batch run would.
+        cc.generate_cover('Warm up', '', output, style, 0, options)
+        for label, (title, subtitle) in TITLES.items():
+            for seed in seeds:
+                timings, hashes = [], set()
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    result = cc.generate_cover(title, subtitle, output, style, seed, options)
+                    timings.append(time.perf_counter() - started)
+                    hashes.add(pixel_hash(output))
+                cases.append(
+                    {
+                        'case': f'{label}/{seed}',
+                        'seconds': min(timings),
+                        'bytes': sum(image.bytes for image in result.images),
+                        'hash': hashes.pop() if len(hashes) == 1 else None,
+                    }
+                )
+    return {
+        'style': style,
+        'seconds': sum(case['seconds'] for case in cases),
+        'peak_rss': peak_rss_bytes(),
+        'bytes': sum(case['bytes'] for case in cases),
+        'deterministic': all(case['hash'] is not None for case in cases),
+        'cases': cases,
+    }
+
+
+def run_benchmarks(styles: tuple[str, ...], seeds: tuple[int, ...], repeat: int, options: cc.RenderOptions) -> list[dict]:
+    """Benchmark each style in its own spawned process so peak RSS is per style."""
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for style in styles:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results.append(pool.submit(bench_style, style, seeds, repeat, options).result())
+    return results
+
+
+def _ratio(current: float | None, previous: float | None) -> float | None:
+    if not current or not previous:
+        return None
+    return current / previous - 1
+
+
+def change_from(result: dict, previous: dict | None, metric: str) -> float | None:
+    """Return the relative change in ``metric``, summed over the cases both runs share."""
+    if previous is None:
+        return None
+    if metric == 'peak_rss':
+        return _ratio(result[metric], previous[metric])
+    previous_cases = {case['case']: case for case in previous['cases']}
+    shared = [case for case in result['cases'] if case['case'] in previous_cases]
+    return _ratio(
+        sum(case[metric] for case in shared),
+        sum(previous_cases[case['case']][metric] for case in shared),
+    )
+
+
+def compare(results: list[dict], baseline: dict, thresholds: dict[str, float]) -> list[str]:
+    """Return a description of every regression against ``baseline``."""
+    problems = []
+    previous_styles = {entry['style']: entry for entry in baseline.get('styles', [])}
+    for result in results:
+        previous = previous_styles.get(result['style'])
+        if previous is None:
+            continue
+        for metric, limit in thresholds.items():
+            change = change_from(result, previous, metric)
+            if change is not None and change > limit:
+                problems.append(f'{result["style"]}: {metric} up {change:.0%} (limit {limit:.0%})')
+        previous_hashes = {case['case']: case['hash'] for case in previous['cases']}
+        for case in result['cases']:
+            expected = previous_hashes.get(case['case'])
+            if expected is not None and case['hash'] is not None and case['hash'] != expected:
+                problems.append(f'{result["style"]}: {case["case"]} renders different pixels than the baseline')
+    return problems
+
+
+def print_report(results: list[dict], baseline: dict | None) -> None:
+    previous_styles = {entry['style']: entry for entry in (baseline or {}).get('styles', [])}
+    print(f'{"style":<20} {"time ms":>9} {"change":>8} {"peak MB":>8} {"KB":>7} {"repeatable":>10}')
+    for result in results:
+        change = change_from(result, previous_styles.get(result['style']), 'seconds')
+        rss = f'{result["peak_rss"] / 1024 / 1024:.0f}' if result['peak_rss'] else 'n/a'
+        print(
+            f'{result["style"]:<20} {result["seconds"] * 1000:>9.0f} '
+            f'{"" if change is None else f"{change:+.0%}":>8} {rss:>8} '
+            f'{result["bytes"] / 1024:>7.0f} {"yes" if result["deterministic"] else "NO":>10}'
+        )
+
+
+def smoke_cli() -> list[str]:
+    """Run cover_creative.py as a user would for every :data:`SMOKE_CASES` output and describe what went wrong."""
+    problems = []
+    with tempfile.TemporaryDirectory(prefix='smoke-covers-') as folder:
+        for output, fmt, frames in SMOKE_CASES:
+            target = output if output == '-' else str(Path(folder) / output)
+            command = [sys.executable, cc.__file__, '--title', 'Smoke test', '--seed', '1', '--no-cache', '--output', target]
+            if frames > 1:
+                command += ['--style', cc.ANIMATED_STYLES[0], '--frames', str(frames)]
+            completed = subprocess.run(command, capture_output=True)
+            if completed.returncode:
+                error = completed.stderr.decode(errors='replace').strip().splitlines()
+                problems.append(f'{output}: exited with {completed.returncode}: {error[-1] if error else "no output"}')
+                continue
+            data = completed.stdout if output == '-' else Path(target).read_bytes()
+            try:
+                with Image.open(io.BytesIO(data)) as img:
+                    written = (img.format, getattr(img, 'n_frames', 1))
+            except OSError as exc:
+                problems.append(f'{output}: unreadable image: {exc}')
+                continue
+            if written != (fmt, frames):
+                problems.append(f'{output}: wrote {written[0]} with {written[1]} frame(s), expected {fmt} with {frames}')
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark cover styles and check that seeded output is repeatable')
+    parser.add_argument(
+        '--styles',
+        type=lambda value: tuple(name.strip() for name in value.split(',') if name.strip()),
+        default=cc.STYLES,
+        help='Comma-separated styles to benchmark. Defaults to every style.',
+    )
+    parser.add_argument(
+        '--seeds',
+        type=cc.parse_seeds,
+        default=DEFAULT_SEEDS,
+        help=f'Comma-separated seeds rendered for every title. Defaults to {",".join(map(str, DEFAULT_SEEDS))}.',
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f'Renders per case; the fastest time is reported. Defaults to {DEFAULT_REPEAT}.',
+    )
+    parser.add_argument(
+        '--blur-quality',
+        default=cc.DEFAULT_BLUR_QUALITY,
+        choices=tuple(cc.BLUR_QUALITY_FACTORS),
+        help=f'Blur quality to benchmark. Defaults to {cc.DEFAULT_BLUR_QUALITY}.',
+    )
+    parser.add_argument(
+        '--compositing',
+        default=cc.DEFAULT_COMPOSITING,
+        choices=cc.COMPOSITING_MODES,
+        help=f'Compositing mode to benchmark. Defaults to {cc.DEFAULT_COMPOSITING}.',
+    )
+    parser.add_argument('--baseline', type=Path, help='Compare against a baseline saved by --save-baseline')
+    parser.add_argument('--save-baseline', type=Path, metavar='PATH', help='Write this run as a baseline JSON file')
+    parser.add_argument('--time-threshold', type=float, default=0.25, help='Allowed slowdown per style. Defaults to 0.25.')
+    parser.add_argument('--rss-threshold', type=float, default=0.15, help='Allowed peak RSS growth. Defaults to 0.15.')
+    parser.add_argument('--bytes-threshold', type=float, default=0.05, help='Allowed output size growth. Defaults to 0.05.')
+    parser.add_argument('--json', action='store_true', help='Print the full results as JSON instead of a table')
+    parser.add_argument(
+        '--smoke',
+        action='store_true',
+        help='Run the cover command line for every still, stdout and animation output instead of benchmarking',
+    )
+    args = parser.parse_args()
+
+    if args.smoke:
+        problems = smoke_cli()
+        print(f'Smoke test: {len(SMOKE_CASES) - len(problems)}/{len(SMOKE_CASES)} outputs written as expected')
+        if problems:
+            for problem in problems:
+                print(f'  - {problem}', file=sys.stderr)
+            raise SystemExit(1)
+        return
+
+    unknown = [style for style in args.styles if style not in cc.STYLES]
+    if unknown:
+        parser.error(f'Unknown style(s): {", ".join(unknown)}')
+    if args.repeat < 1 or not args.seeds:
+        parser.error('--repeat and --seeds need at least one value')
+
+    baseline = None
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        # Older baselines have no compositing key; they used 8-bit blending.
+        recorded = (baseline.get('version'), baseline.get('blur_quality'), baseline.get('compositing', '8bit'))
+        if recorded != (BASELINE_VERSION, args.blur_quality, args.compositing):
+            parser.error(f'{args.baseline} was recorded with a different format, blur quality or compositing mode')
+
+    options = cc.RenderOptions(blur_quality=args.blur_quality, compositing=args.compositing)
+    results = run_benchmarks(args.styles, args.seeds, args.repeat, options)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results, baseline)
+
+    if args.save_baseline is not None:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'version': BASELINE_VERSION,
+            'blur_quality': args.blur_quality,
+            'compositing': args.compositing,
+            'renderer': cc.renderer_version(),
+            'styles': results,
+        }
+        args.save_baseline.write_text(json.dumps(payload, indent=2) + '\n', encoding='utf-8')
+        print(f'Saved baseline -> {args.save_baseline}', file=sys.stderr)
+
+    problems = [f'{result["style"]}: seeded renders are not repeatable' for result in results if not result['deterministic']]
+    if baseline is not None:
+        thresholds = {'seconds': args.time_threshold, 'peak_rss': args.rss_threshold, 'bytes': args.bytes_threshold}
+        problems += compare(results, baseline, thresholds)
+    if problems:
+        print(f'{len(problems)} problem(s):', file=sys.stderr)
+        for problem in problems:
+            print(f'  - {problem}', file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,96 +3,1209 @@
 
 Default behaviour picks a random style each run so covers are not repetitive.
 You can also pin a specific style with --style.
+
+Batch mode renders many covers in one process pool, either from a JSONL/CSV
+manifest (--manifest) or from post front matter under posts/ (--from-posts).
+With --incremental, a build manifest records what each post's cover was made
+from, and only covers whose inputs changed or whose files are missing are
+rendered again.
+
+Server mode (--serve stdin|http) stays resident with warm worker processes
+and answers JSON render requests, so repeated callers skip interpreter start,
+imports and font loading. HTTP requests must be sent as application/json, and
+request outputs must stay inside the working directory or the posts folder.
+
+With --frames N, animated styles are written as a looping APNG, GIF or WebP.
+Each frame advances the style's wave phases or streaks, reuses the cached
+gradient, grid, text layout and glow, and is appended to the file as soon as
+it is rendered, so frames render in parallel without all sitting in memory.
+
+--contact-sheet renders one title in every style (or --sheet-styles) and
+several seeds into a labelled sheet plus a file per cover, one style per
+worker process, so fonts, the title layout and each style's textures and
+glows are made once per worker instead of once per run.
+
+Other Python tools can import render_cover() for an image or
+render_cover_bytes() for an encoded file, and --output - writes the cover to
+stdout, so nothing has to round-trip through the filesystem.
 """
 
 from __future__ import annotations
 
 import argparse
+import base64
+import contextlib
+import csv
+import functools
+import hashlib
+import importlib
+import io
+import json
 import math
+import os
 import random
+import struct
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
 from pathlib import Path
+from typing import BinaryIO
+
+
+class _LazyModule:
+    """Stand-in for a heavy module that is imported on first attribute access.
+
+    The first access replaces the module-level placeholder with the real module,
+    so later lookups cost nothing extra. Metadata-only commands such as --help
+    and --list-styles never touch these and never import Pillow or NumPy.
+    """
+
+    def __init__(self, global_name: str, module_name: str) -> None:
+        self._global_name = global_name
+        self._module_name = module_name
 
-try:
-    from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont
-except ImportError:
-    print('Pillow is required: python -m pip install pillow')
-    raise SystemExit(1)
+    def __getattr__(self, attr: str):
+        try:
+            module = importlib.import_module(self._module_name)
+        except ImportError:
+            print('Pillow and NumPy are required: python -m pip install pillow numpy')
+            raise SystemExit(1) from None
+        globals()[self._global_name] = module
+        return getattr(module, attr)
+
+
+np = _LazyModule('np', 'numpy')
+Image = _LazyModule('Image', 'PIL.Image')
+ImageDraw = _LazyModule('ImageDraw', 'PIL.ImageDraw')
+ImageEnhance = _LazyModule('ImageEnhance', 'PIL.ImageEnhance')
+ImageFilter = _LazyModule('ImageFilter', 'PIL.ImageFilter')
+ImageFont = _LazyModule('ImageFont', 'PIL.ImageFont')
 
 WIDTH, HEIGHT = 1000, 420
 
-FONT_CANDIDATES = (
-    r'C:\Windows\Fonts\segoeuib.ttf',
-    r'C:\Windows\Fonts\seguisb.ttf',
-    r'C:\Windows\Fonts\arialbd.ttf',
-    r'C:\Windows\Fonts\consola.ttf',
-)
-
-STYLES = (
-    'mesh-gradient',
-    'blueprint',
-    'duotone-noise',
-    'sunset-waves',
-    'minimal-paper',
-    'neon-grid',
-    'aurora-mist',
-    'retro-terminal',
-    'copilot-terminal',
-    'geometric-collage',
-)
-
-RANDOM_STYLE_WEIGHTS = {
-    'mesh-gradient': 1.0,
-    'blueprint': 1.0,
-    'duotone-noise': 1.0,
-    'sunset-waves': 1.0,
-    'minimal-paper': 1.0,
-    'neon-grid': 1.0,
-    'aurora-mist': 1.0,
-    'retro-terminal': 1.0,
-    'copilot-terminal': 1.0,
-    'geometric-collage': 1.0,
+# Large-radius soft layers are painted and blurred at 1/factor resolution,
+# then upsampled. Against 'exact', 'high' keeps mesh-gradient and aurora-mist
+# within a mean channel error of 0.5 and 'fast' within 1.0; the largest single
+# differences (up to ~10 and ~30) sit where a blob is clipped by the canvas edge.
+BLUR_QUALITY_FACTORS = {'exact': 1, 'high': 2, 'fast': 4}
+DEFAULT_BLUR_QUALITY = 'high'
+# Never blur a downsampled layer with less than this radius, so small blurs stay exact.
+MIN_SCALED_BLUR_RADIUS = 4
+
+# Named output sizes; "cover" is the DEV.to cover written to --output and
+# every other size is written next to it (main@2x.png, main-og.png, ...).
+OUTPUT_SIZES = {
+    'cover': (WIDTH, HEIGHT),
+    'cover@2x': (WIDTH * 2, HEIGHT * 2),
+    'og': (1200, 630),
+    'thumb': (400, 168),
 }
 
+# Output formats chosen by the output file suffix; any other suffix is rejected.
+IMAGE_FORMATS = {'.png': 'PNG', '.webp': 'WEBP', '.avif': 'AVIF', '.jpg': 'JPEG', '.jpeg': 'JPEG'}
+# Covers keep some translucent pixels; JPEG and GIF have no partial alpha, so they are composited onto this colour.
+OPAQUE_BASE = (0, 0, 0)
+# Palette quantization applies to every PNG, only to styles registered as flat, or never.
+PALETTE_MODES = ('never', 'flat', 'always')
+# Animated covers (--frames) by output suffix: APNG, GIF or animated WebP.
+ANIMATION_FORMATS = {'.png': 'PNG', '.apng': 'PNG', '.gif': 'GIF', '.webp': 'WEBP'}
+DEFAULT_FRAMES = 24
+DEFAULT_FPS = 12
+# Contact sheets (--contact-sheet) put one row per style and one column per seed.
+DEFAULT_SHEET_SEEDS = (1, 2, 3)
+DEFAULT_SHEET_TILE_WIDTH = 400
+
+# Render cache limit and tiers: finished covers, and text-free backgrounds
+# so a title-only change reuses the expensive part of a render.
+DEFAULT_CACHE_SIZE_MB = 256
+CACHE_TIERS = ('covers', 'backgrounds')
+
+# How runs of background layers are blended: in a float32 buffer rounded once,
+# or straight onto the 8-bit canvas, which needs no NumPy and less memory.
+COMPOSITING_MODES = ('float', '8bit')
+DEFAULT_COMPOSITING = 'float'
+# Idle float32 compositing buffers each process keeps for its next render, and
+# how many pixels of a layer are converted to float at a time.
+DEFAULT_SCRATCH_POOL_MB = 64
+COMPOSITE_STRIP_PIXELS = 64 * 1024
+
+# Titles that would wrap to more lines than this shrink their font instead.
+TITLE_MAX_LINES = 3
+
+# Families are tried in order; the first installed one wins.
+FONT_FAMILIES = {
+    'sans': (
+        'Segoe UI',
+        'Arial',
+        'Helvetica Neue',
+        'Helvetica',
+        'Inter',
+        'Noto Sans',
+        'Open Sans',
+        'DejaVu Sans',
+        'Liberation Sans',
+        'Ubuntu',
+        'Cantarell',
+        'Lato',
+    ),
+    'mono': (
+        'Consolas',
+        'Cascadia Mono',
+        'SF Mono',
+        'Menlo',
+        'DejaVu Sans Mono',
+        'Liberation Mono',
+        'Ubuntu Mono',
+        'Noto Sans Mono',
+        'Source Code Pro',
+    ),
+}
 
-def pick_weighted_style(rnd: random.Random) -> str:
-    styles = list(STYLES)
-    weights = [RANDOM_STYLE_WEIGHTS.get(style, 1.0) for style in styles]
-    return rnd.choices(styles, weights=weights, k=1)[0]
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc')
+FONT_INDEX_VERSION = 1
+PROJECT_FONT_DIR = Path(__file__).resolve().parent / 'fonts'
+
+WEIGHT_NAMES = {
+    'thin': 100,
+    'hairline': 100,
+    'extralight': 200,
+    'ultralight': 200,
+    'light': 300,
+    'semilight': 350,
+    'regular': 400,
+    'normal': 400,
+    'book': 400,
+    'roman': 400,
+    'medium': 500,
+    'semibold': 600,
+    'demibold': 600,
+    'bold': 700,
+    'extrabold': 800,
+    'ultrabold': 800,
+    'black': 900,
+    'heavy': 900,
+}
 
 
-def find_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
-    for candidate in FONT_CANDIDATES:
-        path = Path(candidate)
-        if path.exists():
-            try:
-                return ImageFont.truetype(str(path), size)
-            except OSError:
-                continue
-    return ImageFont.load_default()
+@dataclass
+class CoverStyle:
+    """A registered cover style: its metadata and its background and text renderers."""
+
+    name: str
+    weight: float = 1.0
+    description: str = ''
+    flat: bool = False
+    animated: bool = False
+    chrome: bool = False
+    background: Callable | None = None
+    text: Callable | None = None
+
+
+# Styles in registration order; random picks and --list-styles follow this order.
+STYLE_REGISTRY: dict[str, CoverStyle] = {}
+
+
+def register_style(
+    name: str,
+    *,
+    weight: float = 1.0,
+    description: str = '',
+    flat: bool = False,
+    animated: bool = False,
+    chrome: bool = False,
+):
+    """Register the decorated function as the background renderer of a new style.
+
+    The renderer takes ``(rnd, scale)`` and returns a layer graph for
+    :func:`render_layers`; it should make every random draw while building the
+    graph so a seed always yields the same cover. ``weight`` sets how often
+    ``--style random`` picks the style and ``flat`` marks styles that survive
+    palette quantization. ``animated`` renderers take a third argument, the
+    animation phase in radians: phase 0 is the still cover and a full turn
+    comes back to it, so frames loop. ``chrome`` marks styles with a frame,
+    border or text column that must not be cropped: their renderers take a
+    ``width`` keyword, the design width in 1x units (the height is always
+    ``HEIGHT``), and lay the background out again for every aspect ratio
+    instead of being letterboxed. Pair it with :func:`style_text` on the
+    style's text renderer.
+    """
+
+    def decorate(background):
+        if name in STYLE_REGISTRY:
+            raise ValueError(f'Style {name!r} is already registered')
+        STYLE_REGISTRY[name] = CoverStyle(name, weight, description, flat, animated, chrome, background=background)
+        return background
+
+    return decorate
+
+
+def style_text(name: str):
+    """Register the decorated function as the text renderer of style ``name``."""
+
+    def decorate(text):
+        STYLE_REGISTRY[name].text = text
+        return text
+
+    return decorate
+
+
+def pick_weighted_style(rnd: random.Random, animated: bool = False) -> str:
+    styles = [style for style in STYLE_REGISTRY.values() if style.animated or not animated]
+    weights = [style.weight for style in styles]
+    return rnd.choices(styles, weights=weights, k=1)[0].name
+
+
+def default_cache_dir() -> Path:
+    """Return the per-user cache directory, overridable with COVER_CACHE_DIR."""
+    override = os.environ.get('COVER_CACHE_DIR')
+    if override:
+        return Path(override)
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or str(Path.home() / 'AppData' / 'Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / '.cache')
+    return Path(base) / 'cover_creative'
+
+
+def font_search_dirs() -> list[Path]:
+    """Return existing font directories: project, COVER_FONT_DIRS, then user and system."""
+    home = Path.home()
+    candidates = [PROJECT_FONT_DIR]
+    candidates += [Path(entry) for entry in os.environ.get('COVER_FONT_DIRS', '').split(os.pathsep) if entry]
+    if os.name == 'nt':
+        windir = os.environ.get('WINDIR', r'C:\Windows')
+        local = os.environ.get('LOCALAPPDATA', str(home / 'AppData' / 'Local'))
+        candidates += [Path(local) / 'Microsoft' / 'Windows' / 'Fonts', Path(windir) / 'Fonts']
+    elif sys.platform == 'darwin':
+        candidates += [home / 'Library' / 'Fonts', Path('/Library/Fonts'), Path('/System/Library/Fonts')]
+    else:
+        data_home = Path(os.environ.get('XDG_DATA_HOME') or home / '.local' / 'share')
+        candidates += [data_home / 'fonts', home / '.fonts', Path('/usr/local/share/fonts'), Path('/usr/share/fonts')]
+    return [path for path in dict.fromkeys(candidates) if path.is_dir()]
+
+
+def _split_weight(family: str, style: str) -> tuple[str, int, bool]:
+    """Normalise ``(family, style)`` names into a base family, numeric weight and italic flag.
+
+    Legacy fonts often encode the weight in the family name (``Segoe UI
+    Semibold``), so trailing weight words are moved from the family to the weight.
+    """
+    weight = 400
+    words = family.split()
+    while len(words) > 1 and words[-1].lower() in WEIGHT_NAMES:
+        weight = WEIGHT_NAMES[words.pop().lower()]
+    style_key = style.lower().replace(' ', '').replace('-', '')
+    for name, value in sorted(WEIGHT_NAMES.items(), key=lambda item: -len(item[0])):
+        if name in style_key:
+            # "Segoe UI Semibold" / "Regular" keeps the weight from the family name.
+            weight = value if value != 400 else weight
+            break
+    italic = 'italic' in style_key or 'oblique' in style_key
+    return ' '.join(words), weight, italic
+
+
+def _describe_font_file(path: Path) -> list[dict]:
+    """Read the name table of every face in a font file."""
+    faces = []
+    for index in range(16 if path.suffix.lower() == '.ttc' else 1):
+        try:
+            family, style = ImageFont.truetype(str(path), 12, index=index).getname()
+        except OSError:
+            break
+        base, weight, italic = _split_weight(family or path.stem, style or '')
+        faces.append({'path': str(path), 'index': index, 'family': base, 'weight': weight, 'italic': italic})
+    return faces
+
+
+def _scan_font_dirs(dirs: list[Path], previous: dict) -> dict:
+    """Walk ``dirs`` and describe font files, reusing entries whose mtime and size are unchanged."""
+    known: dict[str, tuple[int, int, list[dict]]] = {}
+    for face in previous.get('fonts', []):
+        entry = known.setdefault(face['path'], (face['mtime'], face['size'], []))
+        entry[2].append(face)
+
+    fonts: list[dict] = []
+    dir_mtimes: dict[str, int] = {}
+    for root_dir in dirs:
+        for folder, _, files in os.walk(root_dir):
+            dir_mtimes[folder] = os.stat(folder).st_mtime_ns
+            for name in sorted(files):
+                if not name.lower().endswith(FONT_EXTENSIONS):
+                    continue
+                path = Path(folder) / name
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                cached = known.get(str(path))
+                if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                    fonts.extend(cached[2])
+                    continue
+                for face in _describe_font_file(path):
+                    fonts.append({**face, 'mtime': stat.st_mtime_ns, 'size': stat.st_size})
+    return {'version': FONT_INDEX_VERSION, 'roots': [str(path) for path in dirs], 'dirs': dir_mtimes, 'fonts': fonts}
+
+
+def _font_index_is_current(index: dict, dirs: list[Path]) -> bool:
+    if index.get('version') != FONT_INDEX_VERSION or index.get('roots') != [str(path) for path in dirs]:
+        return False
+    for folder, mtime in index.get('dirs', {}).items():
+        try:
+            if os.stat(folder).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+@functools.cache
+def font_index() -> tuple[dict, ...]:
+    """Return the installed font faces, scanning font directories only when they changed.
+
+    The index is persisted as JSON in the cache directory so later runs only
+    stat the font directories instead of opening every font file.
+    """
+    dirs = font_search_dirs()
+    index_path = default_cache_dir() / 'font-index.json'
+    try:
+        index = json.loads(index_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        index = {}
+
+    if not _font_index_is_current(index, dirs):
+        index = _scan_font_dirs(dirs, index)
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = index_path.with_name(f'{index_path.name}.{os.getpid()}.tmp')
+            temp_path.write_text(json.dumps(index), encoding='utf-8')
+            os.replace(temp_path, index_path)
+        except OSError:
+            pass
+    return tuple(index.get('fonts', []))
+
+
+def resolve_font(role: str = 'sans', weight: int = 700, italic: bool = False) -> tuple[str, int] | None:
+    """Return ``(path, face_index)`` of the closest installed match for a font role.
+
+    Families in ``FONT_FAMILIES[role]`` are tried in order and the face with
+    the nearest weight wins, preferring the heavier face on a tie.
+    """
+    by_family: dict[str, list[dict]] = {}
+    for face in font_index():
+        by_family.setdefault(face['family'].lower(), []).append(face)
+
+    for family in FONT_FAMILIES[role]:
+        faces = [face for face in by_family.get(family.lower(), []) if face['italic'] == italic]
+        if faces:
+            best = min(faces, key=lambda face: (abs(face['weight'] - weight), -face['weight'], face['path']))
+            return best['path'], best['index']
+    return None
+
+
+@functools.cache
+def load_font(path: str, size: int, index: int = 0) -> ImageFont.FreeTypeFont:
+    """Open a TrueType face once per ``(path, size, index)`` for the life of the process."""
+    return ImageFont.truetype(path, size, index=index)
+
+
+@functools.cache
+def find_font(size: int, role: str = 'sans', weight: int = 700) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    # Without a monospace face, terminal text still looks better in the sans face than in Pillow's default.
+    match = resolve_font(role, weight) or resolve_font('sans', weight)
+    if match is not None:
+        try:
+            return load_font(match[0], size, match[1])
+        except OSError:
+            pass
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1 only has the fixed-size bitmap font
+        return ImageFont.load_default()
 
 
 def measure(draw: ImageDraw.ImageDraw, text: str, font) -> tuple[int, int]:
-    left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+    left, top, right, bottom = text_bbox(font, text)
     return int(right - left), int(bottom - top)
 
 
-def wrap_text(draw: ImageDraw.ImageDraw, text: str, font, max_width: int) -> list[str]:
+@functools.lru_cache(maxsize=8192)
+def text_bbox(font, text: str) -> tuple[int, int, int, int]:
+    """Return the ink bounding box of ``text`` drawn at the origin, measured once per (font, text)."""
+    return tuple(int(value) for value in font.getbbox(text))
+
+
+@functools.lru_cache(maxsize=8192)
+def text_advance(font, text: str) -> float:
+    """Return the pen advance of ``text``, measured once per (font, text)."""
+    return font.getlength(text)
+
+
+# Masks of wide title lines run to a few hundred KB at 2x, so keep a bounded number.
+@functools.lru_cache(maxsize=256)
+def text_mask(font, text: str):
+    """Rasterize ``text`` once per (font, text) and return its coverage mask and offset from the draw origin.
+
+    The glow, shadow and fill passes of a line, and terminal snippets that
+    repeat across a batch, all blit this one FreeType rasterization.
+    """
+    profile_count('text_masks')
+    return font.getmask2(text, 'L')
+
+
+def draw_text(draw: ImageDraw.ImageDraw, xy: tuple[int, int], text: str, font, fill: tuple[int, int, int, int]) -> None:
+    """Draw one line of ``text`` at ``xy`` exactly like ``draw.text``, from the mask cached by :func:`text_mask`.
+
+    The fast path uses Pillow internals (``ImageDraw._getink`` and the core
+    ``draw_bitmap``); a Pillow without them gets plain ``draw.text``.
+    """
+    x, y = xy
+    if (
+        not isinstance(font, ImageFont.FreeTypeFont)
+        or '\n' in text
+        or x != int(x)
+        or y != int(y)
+        or not hasattr(draw, '_getink')
+        or not hasattr(draw.draw, 'draw_bitmap')
+    ):
+        draw.text(xy, text, font=font, fill=fill)
+        return
+    mask, offset = text_mask(font, text)
+    # The bitmap blend draw.text finishes with for a single left-anchored line.
+    draw.draw.draw_bitmap((int(x) + offset[0], int(y) + offset[1]), mask, draw._getink(fill)[0])
+
+
+@dataclass(frozen=True)
+class TextLayout:
+    """Wrapped lines with their measured widths, heights and offsets from the block top."""
+
+    lines: tuple[str, ...]
+    widths: tuple[int, ...]
+    heights: tuple[int, ...]
+    offsets: tuple[int, ...]
+    spacing: int
+    font: object = None
+
+    @property
+    def height(self) -> int:
+        return sum(self.heights) + max(0, len(self.lines) - 1) * self.spacing
+
+    @property
+    def width(self) -> int:
+        return max(self.widths, default=0)
+
+    def positions(self, left: int, box_width: int, top: int) -> list[tuple[int, int]]:
+        """Return the draw origin of each line centred in a box ``box_width`` wide."""
+        return [(left + (box_width - width) // 2, top + offset) for width, offset in zip(self.widths, self.offsets)]
+
+
+def _greedy_lines(advances: list[float], space: float, max_width: float) -> int:
+    """Count the lines a greedy wrap produces from word advances alone."""
+    lines, current = 0, None
+    for advance in advances:
+        if current is None:
+            lines, current = lines + 1, advance
+        elif current + space + advance <= max_width:
+            current += space + advance
+        else:
+            lines, current = lines + 1, advance
+    return lines
+
+
+@functools.lru_cache(maxsize=256)
+def layout_text(text: str, font, max_width: int, spacing: int = 0) -> TextLayout:
+    """Greedily wrap ``text`` to ``max_width`` and measure the result.
+
+    Each word and the space are measured once. Candidate line widths are
+    composed from those advances and bearings, and a full line is only
+    measured when the estimate lands within a kerning margin of the limit and
+    once more when a line is finished.
+    """
     words = text.split()
-    if not words:
-        return []
+    space = text_advance(font, ' ')
+    margin = max(2, int(getattr(font, 'size', 10) * 0.08))
+
     lines: list[str] = []
     current: list[str] = []
+    current_advance = 0.0
+    left = 0
     for word in words:
-        candidate = ' '.join(current + [word]) if current else word
-        width, _ = measure(draw, candidate, font)
-        if width <= max_width or not current:
+        if not current:
+            current, current_advance, left = [word], text_advance(font, word), text_bbox(font, word)[0]
+            continue
+        # Ink right edge of the candidate = pen position of the word + its own right bearing.
+        estimate = current_advance + space + text_bbox(font, word)[2] - left
+        if estimate <= max_width - margin:
+            fits = True
+        elif estimate > max_width + margin:
+            fits = False
+        else:
+            candidate = ' '.join(current + [word])
+            fits = text_bbox(font, candidate)[2] - text_bbox(font, candidate)[0] <= max_width
+        if fits:
             current.append(word)
+            current_advance += space + text_advance(font, word)
         else:
             lines.append(' '.join(current))
-            current = [word]
+            current, current_advance, left = [word], text_advance(font, word), text_bbox(font, word)[0]
     if current:
         lines.append(' '.join(current))
-    return lines
+
+    widths, heights, offsets = [], [], []
+    y = 0
+    for line in lines:
+        left, top, right, bottom = text_bbox(font, line)
+        widths.append(right - left)
+        heights.append(bottom - top)
+        offsets.append(y)
+        y += bottom - top + spacing
+    return TextLayout(tuple(lines), tuple(widths), tuple(heights), tuple(offsets), spacing, font)
+
+
+@functools.lru_cache(maxsize=256)
+def fit_text_layout(
+    text: str,
+    size: int,
+    max_width: int,
+    max_lines: int | None = None,
+    min_size: int | None = None,
+    spacing: int = 0,
+    role: str = 'sans',
+    weight: int = 700,
+    step: int = 2,
+) -> TextLayout:
+    """Lay out ``text`` at ``size``, shrinking the font until it wraps to ``max_lines`` or fewer.
+
+    Word advances measured at ``size`` are scaled to estimate the line count
+    at smaller sizes, so only the chosen size is laid out for real.
+    """
+    font = find_font(size, role, weight)
+    layout = layout_text(text, font, max_width, spacing)
+    if max_lines is None or len(layout.lines) <= max_lines or not isinstance(font, ImageFont.FreeTypeFont):
+        return layout
+
+    words = text.split()
+    advances = [text_advance(font, word) for word in words]
+    space = text_advance(font, ' ')
+    min_size = min_size or max(8, size // 2)
+    for candidate_size in range(size - step, min_size - 1, -step):
+        scale = candidate_size / size
+        if _greedy_lines([a * scale for a in advances], space * scale, max_width) > max_lines and candidate_size > min_size:
+            continue
+        layout = layout_text(text, find_font(candidate_size, role, weight), max_width, spacing)
+        if len(layout.lines) <= max_lines:
+            break
+    return layout
+
+
+@dataclass(frozen=True)
+class EncodeOptions:
+    """How finished covers are encoded; the format itself follows the output suffix."""
+
+    compress_level: int = 6
+    optimize: bool = False
+    quality: int = 90
+    lossless: bool = False
+    flatten: bool = True
+    palette: str = 'never'
+    colors: int = 256
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    """Per-render settings shared by every style."""
+
+    blur_quality: str = DEFAULT_BLUR_QUALITY
+    compositing: str = DEFAULT_COMPOSITING
+    encoding: EncodeOptions = EncodeOptions()
+
+
+class Profiler:
+    """Accumulates named span timings and counters while profiling is enabled.
+
+    Spans nest, so a blur inside the background is recorded as
+    ``background/blur``.
+    """
+
+    def __init__(self) -> None:
+        self.spans: dict[str, list] = {}
+        self.counters: dict[str, int] = {}
+        self._stack: list[str] = []
+
+    @contextlib.contextmanager
+    def span(self, name: str):
+        self._stack.append(name)
+        path = '/'.join(self._stack)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stack.pop()
+            entry = self.spans.setdefault(path, [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self) -> dict:
+        return {
+            'spans': {path: {'calls': calls, 'seconds': seconds} for path, (calls, seconds) in self.spans.items()},
+            'counters': dict(self.counters),
+        }
+
+
+_PROFILER: Profiler | None = None
+_NO_SPAN = contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def profiling():
+    """Enable profiling in this process for the duration of the block and yield the profiler."""
+    global _PROFILER
+    previous, _PROFILER = _PROFILER, Profiler()
+    try:
+        yield _PROFILER
+    finally:
+        _PROFILER = previous
+
+
+def profile_span(name: str):
+    """Time a named stage while profiling; otherwise return a shared no-op context."""
+    return _NO_SPAN if _PROFILER is None else _PROFILER.span(name)
+
+
+def profile_count(name: str, amount: int = 1) -> None:
+    if _PROFILER is not None:
+        _PROFILER.count(name, amount)
+
+
+def profiled(name: str):
+    """Decorate a function so each call is recorded as a span named ``name`` while profiling."""
+
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _PROFILER is None:
+                return fn(*args, **kwargs)
+            with _PROFILER.span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def merge_profile(total: dict, snapshot: dict) -> dict:
+    """Add a profiler snapshot into an aggregate built the same way."""
+    total['covers'] = total.get('covers', 0) + 1
+    spans = total.setdefault('spans', {})
+    for path, entry in snapshot['spans'].items():
+        merged = spans.setdefault(path, {'calls': 0, 'seconds': 0.0})
+        merged['calls'] += entry['calls']
+        merged['seconds'] += entry['seconds']
+    counters = total.setdefault('counters', {})
+    for name, amount in snapshot['counters'].items():
+        counters[name] = counters.get(name, 0) + amount
+    return total
+
+
+def format_profile(style: str, profile: dict) -> str:
+    """Render an aggregated profile as an indented table of total and self time per stage."""
+    covers = profile['covers']
+    spans = profile['spans']
+    lines = [
+        f'Profile: {style} ({covers} cover(s))',
+        f'  {"stage":<28} {"calls":>7} {"total ms":>10} {"self ms":>10} {"ms/cover":>9}',
+    ]
+    for path in sorted(spans, key=lambda path: path.split('/')):
+        entry = spans[path]
+        depth = path.count('/')
+        children = sum(
+            child['seconds'] for name, child in spans.items() if name.startswith(path + '/') and name.count('/') == depth + 1
+        )
+        label = '  ' * depth + path.rsplit('/', 1)[-1]
+        lines.append(
+            f'  {label:<28} {entry["calls"]:>7} {entry["seconds"] * 1000:>10.1f} '
+            f'{(entry["seconds"] - children) * 1000:>10.1f} {entry["seconds"] * 1000 / covers:>9.1f}'
+        )
+    for name, amount in sorted(profile['counters'].items()):
+        lines.append(f'  {name:<28} {amount:>7} ({amount / covers:.0f}/cover)')
+    return '\n'.join(lines)
+
+
+def canvas_size(scale: float = 1, width: float = WIDTH) -> tuple[int, int]:
+    """Return the pixel size of a design canvas ``width`` units wide drawn at ``scale``."""
+    return round(width * scale), round(HEIGHT * scale)
+
+
+def canvas_scale(img: Image.Image) -> float:
+    """Return the design-to-pixel scale of a canvas; the height drives it, the width may vary."""
+    return img.height / HEIGHT
+
+
+def scaled(value: float, scale: float) -> int:
+    """Convert a design-unit length to whole pixels."""
+    return int(round(value * scale))
+
+
+def stroke(width: float, scale: float) -> int:
+    """Convert a design-unit line width to pixels, never thinner than one pixel."""
+    return max(1, scaled(width, scale))
+
+
+def scale_box(box: tuple[float, ...], scale: float) -> tuple[float, ...]:
+    """Scale every coordinate of a design-unit box or line."""
+    return tuple(value * scale for value in box)
+
+
+def blur_reach(radius: float) -> int:
+    """Return how far GaussianBlur(radius) spreads ink, with a little headroom."""
+    return int(math.ceil(radius * 3)) + 2
+
+
+def _crop_box(size: tuple[int, int], bbox: tuple[float, ...], reach: int) -> tuple[int, int, int, int]:
+    """Grow ``bbox`` by ``reach`` to whole pixels, clamped to a canvas of ``size``."""
+    left, top = max(0, math.floor(bbox[0]) - reach), max(0, math.floor(bbox[1]) - reach)
+    right, bottom = min(size[0], math.ceil(bbox[2]) + reach), min(size[1], math.ceil(bbox[3]) + reach)
+    return left, top, right, bottom
+
+
+def new_layer(size: tuple[int, int], fill: tuple[int, int, int, int] = (0, 0, 0, 0)) -> Image.Image:
+    """Allocate an RGBA layer, counted while profiling."""
+    profile_count('layers')
+    return Image.new('RGBA', size, fill)
+
+
+def blur_layer(layer: Image.Image, radius: float) -> Image.Image:
+    """Gaussian-blur a layer, timed and counted while profiling."""
+    profile_count('blur_pixels', layer.width * layer.height)
+    with profile_span('blur'):
+        return layer.filter(ImageFilter.GaussianBlur(radius))
+
+
+def composite_layer(img: Image.Image, layer: Image.Image, dest: tuple[int, int] = (0, 0)) -> None:
+    """Alpha-composite ``layer`` onto ``img`` at ``dest``, timed while profiling."""
+    with profile_span('composite'):
+        img.alpha_composite(layer, dest=dest)
+
+
+def quantize_planes(planes, scale, out) -> None:
+    """Round premultiplied float32 ``planes`` (RGBA, rows, columns) into the straight-alpha uint8 array ``out``.
+
+    ``planes`` is overwritten and ``scale`` is a scratch plane of the same rows and columns.
+    """
+    np.maximum(planes[3], np.float32(1 / 512), out=scale)
+    np.divide(np.float32(255), scale, out=scale)
+    planes[:3] *= scale
+    planes[3] *= np.float32(255)
+    planes += np.float32(0.5)
+    np.clip(planes, 0, 255, out=planes)
+    for channel in range(4):
+        out[..., channel] = planes[channel]
+
+
+class ScratchPool:
+    """Float32 arrays kept between renders, so a batch worker stops reallocating its working buffers.
+
+    Arrays are handed out as views of the smallest free array that is large
+    enough; once more than ``max_bytes`` sit idle the oldest are dropped.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.free: list = []
+        self.lock = threading.Lock()
+
+    def take(self, shape: tuple[int, ...]):
+        """Return ``(array, handle)``: an uninitialised float32 array of ``shape`` and what to give back."""
+        count = math.prod(shape)
+        with self.lock:
+            fits = [index for index, flat in enumerate(self.free) if flat.size >= count]
+            flat = self.free.pop(min(fits, key=lambda index: self.free[index].size)) if fits else None
+        if flat is None:
+            profile_count('scratch_bytes', count * 4)
+            flat = np.empty(count, dtype=np.float32)
+        return flat[:count].reshape(shape), flat
+
+    def give(self, flat) -> None:
+        with self.lock:
+            self.free.append(flat)
+            while sum(array.nbytes for array in self.free) > self.max_bytes:
+                self.free.pop(0)
+
+
+SCRATCH_POOL = ScratchPool(DEFAULT_SCRATCH_POOL_MB * 1024 * 1024)
+
+
+class CompositeBuffer:
+    """A premultiplied float32 copy of part of a canvas that layers are blended into without rounding.
+
+    Pillow rounds to 8 bits after every ``alpha_composite``; here each layer
+    is added in floating point and ``box`` is quantized back into the canvas
+    once by :meth:`store`. Channels are stored as separate planes and layers
+    are converted a strip of rows at a time, so the only full-size float
+    array is the buffer itself. Drawing still happens on the 8-bit canvas, so
+    store before drawing and open a new buffer afterwards.
+    """
+
+    def __init__(self, img: Image.Image, box: tuple[int, int, int, int], pool: ScratchPool = SCRATCH_POOL) -> None:
+        self.img = img
+        self.box = box
+        self.pool = pool
+        width, height = box[2] - box[0], box[3] - box[1]
+        self.handles = []
+        self.pixels = self._take((4, height, width))
+        self.strip = [self._take((max(COMPOSITE_STRIP_PIXELS, width),)) for _ in range(3)]
+        with profile_span('premultiply'):
+            for top, count, _ in self._strips(height, width):
+                strip = np.asarray(img.crop((box[0], box[1] + top, box[2], box[1] + top + count)))
+                planes = self.pixels[:, top:top + count]
+                for channel in range(4):
+                    np.multiply(strip[..., channel], np.float32(1 / 255), out=planes[channel])
+                planes[:3] *= planes[3]
+
+    def _take(self, shape: tuple[int, ...]):
+        array, handle = self.pool.take(shape)
+        self.handles.append(handle)
+        return array
+
+    def _strips(self, height: int, width: int):
+        """Yield ``(top, rows, scratch)`` per strip of a ``width`` x ``height`` area, with three float scratch planes."""
+        rows = max(1, self.strip[0].size // width)
+        for top in range(0, height, rows):
+            count = min(rows, height - top)
+            yield top, count, [plane[:count * width].reshape(count, width) for plane in self.strip]
+
+    def composite(self, layer: Image.Image, dest: tuple[int, int] = (0, 0)) -> None:
+        """Blend ``layer`` over the buffer at canvas position ``dest``: ``out = layer + out * (1 - layer alpha)``."""
+        with profile_span('composite'):
+            left, top = dest[0] - self.box[0], dest[1] - self.box[1]
+            source = np.asarray(layer)
+            for row, count, (alpha, transparency, colour) in self._strips(layer.height, layer.width):
+                strip = source[row:row + count]
+                np.multiply(strip[..., 3], np.float32(1 / 255), out=alpha)
+                np.subtract(np.float32(1), alpha, out=transparency)
+                region = self.pixels[:, top + row:top + row + count, left:left + layer.width]
+                for channel in range(3):
+                    np.multiply(strip[..., channel], alpha, out=colour)
+                    colour *= np.float32(1 / 255)
+                    region[channel] *= transparency
+                    region[channel] += colour
+                region[3] *= transparency
+                region[3] += alpha
+
+    def store(self) -> None:
+        """Quantize the buffer back into the canvas once and return the scratch arrays to the pool."""
+        with profile_span('quantize'):
+            height, width = self.pixels.shape[1:]
+            for top, count, (scale, _, _) in self._strips(height, width):
+                quantized = np.empty((count, width, 4), dtype=np.uint8)
+                quantize_planes(self.pixels[:, top:top + count], scale, quantized)
+                self.img.paste(Image.fromarray(quantized, 'RGBA'), (self.box[0], self.box[1] + top))
+        self.pixels = None
+        for handle in self.handles:
+            self.pool.give(handle)
+        self.handles = []
+
+
+@dataclass(frozen=True)
+class Fill:
+    """Start the canvas with a solid colour."""
+
+    colour: tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class Gradient:
+    """Start the canvas with a linear gradient; see :func:`linear_gradient`."""
+
+    colours: tuple
+    positions: tuple | None = None
+    angle: float = 90.0
+
+
+@dataclass(frozen=True)
+class Shapes:
+    """Draw straight onto the canvas with ``paint(draw)``."""
+
+    paint: Callable[[ImageDraw.ImageDraw], None]
+
+
+@dataclass(frozen=True)
+class Blend:
+    """Alpha-composite a full-canvas image made by ``make(size)`` over the canvas."""
+
+    make: Callable[[tuple[int, int]], Image.Image]
+
+
+@dataclass(frozen=True)
+class Overlay:
+    """Replace the canvas pixels covered by a cached :func:`line_texture`, as drawing its lines would."""
+
+    scale: float
+    vertical: GridLines | None = None
+    horizontal: GridLines | None = None
+    width: float = WIDTH
+
+    def apply(self, img: Image.Image) -> None:
+        texture, mask = line_texture(self.scale, self.vertical, self.horizontal, self.width)
+        img.paste(texture, (0, 0), mask)
+
+
+@dataclass(frozen=True)
+class Layer:
+    """Paint into a transparent layer, optionally blur it, and composite it over the canvas.
+
+    ``paint(draw, origin, layer_scale)`` gets the canvas position of the
+    layer's top-left corner and the factor to multiply canvas-relative
+    coordinates by (below 1 for ``soft`` layers drawn at reduced resolution).
+    ``bbox`` bounds the painted pixels, or None for the whole canvas; only
+    that area plus the blur reach is allocated and blurred.
+    """
+
+    paint: Callable[[ImageDraw.ImageDraw, tuple[int, int], float], None]
+    bbox: tuple[float, float, float, float] | None = None
+    blur: float = 0
+    soft: bool = False
+
+
+def _layer_factor(layer: Layer, quality: str) -> int:
+    """Return how far a soft layer is downsampled before blurring; 1 for every other layer."""
+    if not layer.soft or not layer.blur:
+        return 1
+    return min(BLUR_QUALITY_FACTORS[quality], max(1, int(layer.blur // MIN_SCALED_BLUR_RADIUS)))
+
+
+def _layer_footprint(size: tuple[int, int], layer: Layer) -> tuple[int, int, int, int]:
+    bbox = layer.bbox if layer.bbox is not None else (0, 0, *size)
+    return _crop_box(size, bbox, blur_reach(layer.blur) if layer.blur else 0)
+
+
+def _overlaps(a: tuple[int, int, int, int], b: tuple[int, int, int, int]) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _paint_group(size: tuple[int, int], layers: list[Layer], factor: int) -> tuple[Image.Image, tuple[int, int]] | None:
+    """Paint ``layers`` into one scratch layer and blur it once.
+
+    Returns the layer and where it goes on a canvas of ``size``, or None when
+    the layers fall outside the canvas.
+    """
+    footprints = [_layer_footprint(size, layer) for layer in layers]
+    left, top = min(box[0] for box in footprints), min(box[1] for box in footprints)
+    right, bottom = max(box[2] for box in footprints), max(box[3] for box in footprints)
+    if right <= left or bottom <= top:
+        return None
+    width, height = right - left, bottom - top
+
+    scratch = new_layer((math.ceil(width / factor), math.ceil(height / factor)))
+    draw = ImageDraw.Draw(scratch, 'RGBA')
+    for layer in layers:
+        layer.paint(draw, (left, top), 1 / factor)
+    radius = layers[0].blur
+    if radius:
+        scratch = blur_layer(scratch, radius / factor)
+    if factor > 1:
+        with profile_span('upscale'):
+            scratch = scratch.resize((width, height), Image.BILINEAR, box=(0, 0, width / factor, height / factor))
+    return scratch, (left, top)
+
+
+def _composite_group(img: Image.Image, layers: list[Layer], factor: int, target: CompositeBuffer | None = None) -> None:
+    """Paint ``layers`` into one scratch layer, blur it once and composite it once.
+
+    The layers share a blur radius and, when there is more than one, have
+    disjoint footprints, so no pixel sees more than one of them and the result
+    matches handling each on its own. With a ``target`` buffer the layer is
+    blended into it instead of into ``img``.
+    """
+    painted = _paint_group(img.size, layers, factor)
+    if painted is None:
+        return
+    scratch, dest = painted
+    if target is not None:
+        target.composite(scratch, dest)
+    else:
+        composite_layer(img, scratch, dest)
+
+
+def _fusable_runs(img: Image.Image, layers: list[Layer], quality: str):
+    """Split consecutive layers into runs that can share one scratch layer and blur pass.
+
+    A layer joins the current run when it has the same blur, is drawn at full
+    resolution and its footprint is clear of every layer already in the run.
+    Overlapping layers stay separate: blurring each before compositing is what
+    gives soft bands their darker edges, and one shared blur would wash them out.
+    """
+    run: list[Layer] = []
+    run_boxes: list[tuple[int, int, int, int]] = []
+    for layer in layers:
+        factor = _layer_factor(layer, quality)
+        box = _layer_footprint(img.size, layer)
+        if (
+            run
+            and factor == 1
+            and _layer_factor(run[0], quality) == 1
+            and layer.blur == run[0].blur
+            and not any(_overlaps(box, other) for other in run_boxes)
+        ):
+            run.append(layer)
+            run_boxes.append(box)
+            continue
+        if run:
+            yield run, _layer_factor(run[0], quality)
+        run, run_boxes = [layer], [box]
+    if run:
+        yield run, _layer_factor(run[0], quality)
+
+
+def _blend_run(img: Image.Image, steps: list, options: RenderOptions) -> None:
+    """Composite consecutive :class:`Layer` and :class:`Blend` steps over the canvas.
+
+    With float compositing, a run that composites more than once is blended
+    into a :class:`CompositeBuffer` covering the union of its footprints and
+    rounded to 8 bits once; a single composite goes straight onto the canvas.
+    """
+    groups: list = []
+    index = 0
+    while index < len(steps):
+        step = steps[index]
+        if isinstance(step, Blend):
+            groups.append(step)
+            index += 1
+            continue
+        if not isinstance(step, Layer):
+            raise TypeError(f'Unknown layer graph step: {type(step).__name__}')
+        end = index
+        while end < len(steps) and isinstance(steps[end], Layer):
+            end += 1
+        groups.extend(_fusable_runs(img, steps[index:end], options.blur_quality))
+        index = end
+
+    buffer = None
+    if options.compositing == 'float' and len(groups) > 1:
+        if any(isinstance(group, Blend) for group in groups):
+            boxes = [(0, 0, img.width, img.height)]
+        else:
+            boxes = [_layer_footprint(img.size, layer) for run, _ in groups for layer in run]
+        left, top = min(box[0] for box in boxes), min(box[1] for box in boxes)
+        buffer = CompositeBuffer(img, (left, top, max(box[2] for box in boxes), max(box[3] for box in boxes)))
+    for group in groups:
+        if isinstance(group, Blend):
+            layer = group.make(img.size)
+            if buffer is not None:
+                buffer.composite(layer)
+            else:
+                composite_layer(img, layer)
+        else:
+            _composite_group(img, *group, buffer)
+    if buffer is not None:
+        buffer.store()
+
+
+# Gradient and overlay starts are seed-independent; keep one per style and scale.
+@functools.lru_cache(maxsize=16)
+def base_canvas(size: tuple[int, int], base: Fill | Gradient, overlays: tuple[Overlay, ...] = ()) -> Image.Image:
+    """Render the start of a layer graph, its base and the overlays straight after it, once per process.
+
+    The image is shared between renders, so copy it before drawing on it.
+    """
+    if isinstance(base, Fill):
+        img = Image.new('RGBA', size, base.colour)
+    elif isinstance(base, Gradient):
+        img = linear_gradient(size, base.colours, base.positions, base.angle)
+    else:
+        raise TypeError(f'A layer graph must start with Fill or Gradient, not {type(base).__name__}')
+    for overlay in overlays:
+        overlay.apply(img)
+    return img
+
+
+def render_layers(size: tuple[int, int], graph: list, options: RenderOptions) -> Image.Image:
+    """Execute a background layer graph and return the canvas.
+
+    The graph starts with a :class:`Fill` or :class:`Gradient`, followed by
+    :class:`Shapes`, :class:`Overlay`, :class:`Blend` and :class:`Layer`
+    steps in paint order. The base and any overlays right after it come from
+    :func:`base_canvas`.
+    Every ``Shapes`` step shares one draw target on the canvas, and runs of
+    layers with the same blur and disjoint footprints share one scratch layer,
+    one blur pass and one composite. The steps between two ``Shapes`` steps
+    are blended in floating point and rounded once; see :func:`_blend_run`.
+    """
+    base, steps = graph[0], graph[1:]
+    overlays = 0
+    while overlays < len(steps) and isinstance(steps[overlays], Overlay):
+        overlays += 1
+    if isinstance(base, Fill) and not overlays:
+        img = Image.new('RGBA', size, base.colour)
+    else:
+        img = base_canvas(size, base, tuple(steps[:overlays])).copy()
+
+    draw = None
+    index = overlays
+    while index < len(steps):
+        step = steps[index]
+        if isinstance(step, Overlay):
+            step.apply(img)
+            index += 1
+            continue
+        if isinstance(step, Shapes):
+            if draw is None:
+                draw = ImageDraw.Draw(img, 'RGBA')
+            step.paint(draw)
+            index += 1
+            continue
+        end = index
+        while end < len(steps) and not isinstance(steps[end], (Shapes, Overlay)):
+            end += 1
+        _blend_run(img, steps[index:end], options)
+        index = end
+    return img
+
+
+def composite_text_glow(
+    img: Image.Image,
+    xy: tuple[int, int],
+    text: str,
+    font,
+    fill: tuple[int, int, int, int],
+    radius: float,
+) -> None:
+    """Composite a blurred copy of ``text`` at ``xy`` as a glow behind it."""
+    glow = text_glow(img.size, xy, text, font, fill, radius)
+    if glow is not None:
+        composite_layer(img, *glow)
+
+
+# A cover has a glow per title line; animation frames and style previews redraw the same few.
+@functools.lru_cache(maxsize=32)
+def text_glow(
+    size: tuple[int, int],
+    xy: tuple[int, int],
+    text: str,
+    font,
+    fill: tuple[int, int, int, int],
+    radius: float,
+) -> tuple[Image.Image, tuple[int, int]] | None:
+    """Paint and blur the glow of ``text`` at ``xy`` on a canvas of ``size`` once, and return it with its position.
+
+    The glow does not depend on what is under it, so every frame of an
+    animation composites the same layer. The layer is shared; do not modify it.
+    """
+    x, y = xy
+    left, top, right, bottom = text_bbox(font, text)
+
+    def paint(draw: ImageDraw.ImageDraw, origin: tuple[int, int], layer_scale: float) -> None:
+        draw_text(draw, (x - origin[0], y - origin[1]), text, font, fill)
+
+    return _paint_group(size, [Layer(paint, (x + left, y + top, x + right, y + bottom), radius)], 1)
 
 
 def draw_centered_text(
@@ -104,50 +1217,287 @@ def draw_centered_text(
     glow_fill: tuple[int, int, int, int] | None = None,
 ) -> None:
     draw = ImageDraw.Draw(img, 'RGBA')
-    title_font = find_font(52)
-    subtitle_font = find_font(22)
-    max_width = int(WIDTH * 0.84)
-
-    title_lines = wrap_text(draw, title, title_font, max_width)
-    subtitle_lines = wrap_text(draw, subtitle, subtitle_font, max_width)
-
-    title_height = sum(measure(draw, line, title_font)[1] for line in title_lines) + (
-        max(0, len(title_lines) - 1) * 8
-    )
-    subtitle_height = sum(measure(draw, line, subtitle_font)[1] for line in subtitle_lines) + (
-        max(0, len(subtitle_lines) - 1) * 6
-    )
-
-    total_height = title_height + 18 + subtitle_height
-    y = (HEIGHT - total_height) // 2
+    scale = canvas_scale(img)
+    max_width = int(img.width * 0.84)
+
+    with profile_span('layout'):
+        title_layout = fit_text_layout(
+            title,
+            scaled(52, scale),
+            max_width,
+            TITLE_MAX_LINES,
+            min_size=scaled(36, scale),
+            spacing=scaled(8, scale),
+        )
+        subtitle_layout = layout_text(subtitle, find_font(scaled(22, scale)), max_width, spacing=scaled(6, scale))
+    title_font, subtitle_font = title_layout.font, subtitle_layout.font
 
-    for line in title_lines:
-        width, line_height = measure(draw, line, title_font)
-        x = (WIDTH - width) // 2
+    gap = scaled(18, scale)
+    total_height = title_layout.height + gap + subtitle_layout.height
+    top = (img.height - total_height) // 2
 
+    shadow = scaled(2, scale)
+    for line, (x, y) in zip(title_layout.lines, title_layout.positions(0, img.width, top)):
         if glow_fill is not None:
-            glow = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-            gdraw = ImageDraw.Draw(glow, 'RGBA')
-            gdraw.text((x, y), line, font=title_font, fill=glow_fill)
-            glow = glow.filter(ImageFilter.GaussianBlur(8))
-            img.alpha_composite(glow)
-
-        draw.text((x + 2, y + 2), line, font=title_font, fill=(0, 0, 0, 120))
-        draw.text((x, y), line, font=title_font, fill=title_fill)
-        y += line_height + 8
-
-    y += 10
-    for line in subtitle_lines:
-        width, line_height = measure(draw, line, subtitle_font)
-        x = (WIDTH - width) // 2
-        draw.text((x + 1, y + 1), line, font=subtitle_font, fill=(0, 0, 0, 90))
-        draw.text((x, y), line, font=subtitle_font, fill=subtitle_fill)
-        y += line_height + 6
-
-
-def style_mesh_gradient(title: str, subtitle: str, output_path: Path, rnd: random.Random) -> None:
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (18, 20, 45, 255))
-
+            composite_text_glow(img, (x, y), line, title_font, glow_fill, 8 * scale)
+
+        draw_text(draw, (x + shadow, y + shadow), line, title_font, (0, 0, 0, 120))
+        draw_text(draw, (x, y), line, title_font, title_fill)
+
+    top += title_layout.height + gap
+    shadow = scaled(1, scale)
+    for line, (x, y) in zip(subtitle_layout.lines, subtitle_layout.positions(0, img.width, top)):
+        draw_text(draw, (x + shadow, y + shadow), line, subtitle_font, (0, 0, 0, 90))
+        draw_text(draw, (x, y), line, subtitle_font, subtitle_fill)
+
+
+def _gradient_ramp(t: np.ndarray, colours, positions=None) -> np.ndarray:
+    """Map ``t`` in [0, 1] onto a multi-stop colour ramp, returning uint8 RGBA."""
+    stops = np.array([tuple(c) + (255,) * (4 - len(c)) for c in colours], dtype=np.float64)
+    if positions is None:
+        positions = np.linspace(0.0, 1.0, len(stops))
+    positions = np.asarray(positions, dtype=np.float64)
+    if len(stops) == 1:
+        return np.broadcast_to(stops[0].astype(np.uint8), t.shape + (4,))
+
+    t = np.clip(t, positions[0], positions[-1])
+    segment = np.clip(np.searchsorted(positions, t, side='right') - 1, 0, len(stops) - 2)
+    start, end = positions[segment], positions[segment + 1]
+    local = (t - start) / np.where(end > start, end - start, 1.0)
+    low, high = stops[segment], stops[segment + 1]
+    # Same arithmetic and truncation as the old per-row int(a + (b - a) * t) loops.
+    values = low + (high - low) * local[..., None]
+    return np.clip(values, 0, 255).astype(np.uint8)
+
+
+GRADIENT_LUT_SIZE = 4096
+
+
+def _gradient_field(t: np.ndarray, colours, positions=None) -> np.ndarray:
+    """Colour a 2D ``t`` field through a lookup table instead of per-pixel interpolation."""
+    lut = _gradient_ramp(np.linspace(0.0, 1.0, GRADIENT_LUT_SIZE), colours, positions)
+    index = np.clip(t, 0.0, 1.0) * np.float32(GRADIENT_LUT_SIZE - 1) + np.float32(0.5)
+    return lut[index.astype(np.intp)]
+
+
+@profiled('gradient')
+def linear_gradient(size: tuple[int, int], colours, positions=None, angle: float = 90.0) -> Image.Image:
+    """Return an RGBA image filled with a linear gradient.
+
+    ``colours`` are RGB or RGBA stops spread evenly unless ``positions`` gives
+    their offsets in [0, 1]. ``angle`` is in degrees: 90 runs top to bottom,
+    0 runs left to right.
+    """
+    width, height = size
+    radians = math.radians(angle)
+    dx, dy = round(math.cos(radians), 12), round(math.sin(radians), 12)
+
+    if dx == 0:
+        t = np.arange(height, dtype=np.float64) / max(height - 1, 1)
+        column = _gradient_ramp(t if dy > 0 else 1.0 - t, colours, positions)
+        pixels = np.broadcast_to(column[:, None, :], (height, width, 4))
+    elif dy == 0:
+        t = np.arange(width, dtype=np.float64) / max(width - 1, 1)
+        row = _gradient_ramp(t if dx > 0 else 1.0 - t, colours, positions)
+        pixels = np.broadcast_to(row[None, :, :], (height, width, 4))
+    else:
+        xs = np.arange(width, dtype=np.float32)[None, :] * np.float32(dx)
+        ys = np.arange(height, dtype=np.float32)[:, None] * np.float32(dy)
+        projection = xs + ys
+        low, high = projection.min(), projection.max()
+        pixels = _gradient_field((projection - low) / max(high - low, 1e-9), colours, positions)
+
+    return Image.fromarray(np.ascontiguousarray(pixels), 'RGBA')
+
+
+@profiled('gradient')
+def radial_gradient(
+    size: tuple[int, int],
+    colours,
+    positions=None,
+    centre: tuple[float, float] | None = None,
+    radius: float | None = None,
+) -> Image.Image:
+    """Return an RGBA image filled with a radial gradient from ``centre`` out to ``radius``."""
+    width, height = size
+    cx, cy = centre if centre is not None else ((width - 1) / 2, (height - 1) / 2)
+    if radius is None:
+        radius = math.hypot(max(cx, width - 1 - cx), max(cy, height - 1 - cy))
+    ys = (np.arange(height, dtype=np.float32) - np.float32(cy))[:, None]
+    xs = (np.arange(width, dtype=np.float32) - np.float32(cx))[None, :]
+    t = np.sqrt(xs * xs + ys * ys) * np.float32(1.0 / max(radius, 1e-9))
+    return Image.fromarray(_gradient_field(t, colours, positions), 'RGBA')
+
+
+GRAIN_KINDS = ('uniform', 'gaussian', 'film')
+
+
+def numpy_rng(rnd: random.Random) -> np.random.Generator:
+    """Derive a NumPy generator from the style's ``random.Random`` so --seed still pins the output."""
+    return np.random.default_rng(rnd.getrandbits(64))
+
+
+@profiled('grain')
+def grain_layer(
+    size: tuple[int, int],
+    rng: np.random.Generator,
+    kind: str = 'uniform',
+    density: float = 0.035,
+    shade: tuple[int, int] = (160, 255),
+    alpha: tuple[int, int] = (10, 38),
+) -> Image.Image:
+    """Return a transparent RGBA layer of grain specks generated in one array pass.
+
+    ``uniform`` scatters grey specks with shade and alpha drawn uniformly from
+    the given inclusive ranges. ``gaussian`` centres both on the middle of the
+    range. ``film`` covers the canvas with clumped light and dark grain whose
+    strength follows a normal distribution. ``density`` is the fraction of
+    pixels that receive a speck.
+    """
+    if kind not in GRAIN_KINDS:
+        raise ValueError(f'Unknown grain kind: {kind}')
+    profile_count('layers')
+    width, height = size
+    pixels = np.zeros((height * width, 4), dtype=np.uint8)
+
+    if kind == 'film':
+        # Half-resolution noise upsampled bilinearly gives grain a little clumping.
+        small = rng.standard_normal(((height + 1) // 2, (width + 1) // 2)).astype(np.float32)
+        noise = np.asarray(Image.fromarray(small, 'F').resize((width, height), Image.BILINEAR)).reshape(-1)
+        keep = rng.random(noise.shape, dtype=np.float32) < density
+        strength = np.clip(np.abs(noise) / 2.5, 0.0, 1.0)
+        pixels[:, :3] = np.where(noise >= 0, shade[1], 255 - shade[1]).astype(np.uint8)[:, None]
+        pixels[:, 3] = np.where(keep, alpha[0] + strength * (alpha[1] - alpha[0]), 0).astype(np.uint8)
+        return Image.fromarray(pixels.reshape(height, width, 4), 'RGBA')
+
+    count = int(round(density * width * height))
+    index = rng.integers(0, width * height, count)
+    if kind == 'uniform':
+        shades = rng.integers(shade[0], shade[1] + 1, count)
+        alphas = rng.integers(alpha[0], alpha[1] + 1, count)
+    else:
+        shades = rng.normal((shade[0] + shade[1]) / 2, (shade[1] - shade[0]) / 4, count)
+        alphas = rng.normal((alpha[0] + alpha[1]) / 2, (alpha[1] - alpha[0]) / 4, count)
+        shades = np.clip(np.rint(shades), shade[0], shade[1])
+        alphas = np.clip(np.rint(alphas), alpha[0], alpha[1])
+
+    pixels[index, :3] = shades.astype(np.uint8)[:, None]
+    pixels[index, 3] = alphas.astype(np.uint8)
+    return Image.fromarray(pixels.reshape(height, width, 4), 'RGBA')
+
+
+@dataclass(frozen=True)
+class GridLines:
+    """Full-length lines every ``spacing`` 1x pixels along one axis; every ``major``-th line uses ``major_colour``."""
+
+    spacing: int
+    colour: tuple[int, int, int, int]
+    major: int = 0
+    major_colour: tuple[int, int, int, int] | None = None
+
+    def colour_of(self, index: int) -> tuple[int, int, int, int]:
+        return self.major_colour if self.major and index % self.major == 0 else self.colour
+
+
+# Textures are full-canvas, so a few per scale are enough for every style.
+@functools.lru_cache(maxsize=8)
+@profiled('texture')
+def line_texture(
+    scale: float,
+    vertical: GridLines | None = None,
+    horizontal: GridLines | None = None,
+    width: float = WIDTH,
+) -> tuple[Image.Image, Image.Image]:
+    """Draw a grid or scanline texture for a canvas ``width`` units wide once per process and return ``(texture, mask)``.
+
+    Vertical lines are drawn before horizontal ones, one canvas pixel wide
+    per 1x pixel and without anti-aliasing, so pasting the texture through
+    ``mask`` gives the same pixels as drawing the lines onto the canvas. The
+    texture can also be alpha-composited as a layer. Both images are shared;
+    do not modify them.
+    """
+    columns = math.ceil(width)
+    width, height = canvas_size(scale, width)
+    texture = new_layer((width, height))
+    draw = ImageDraw.Draw(texture, 'RGBA')
+    line_width = stroke(1, scale)
+    if vertical is not None:
+        for index, x in enumerate(range(0, columns, vertical.spacing)):
+            draw.line([(x * scale, 0), (x * scale, height)], fill=vertical.colour_of(index), width=line_width)
+    if horizontal is not None:
+        for index, y in enumerate(range(0, HEIGHT, horizontal.spacing)):
+            draw.line([(0, y * scale), (width, y * scale)], fill=horizontal.colour_of(index), width=line_width)
+    mask = texture.getchannel('A').point(lambda alpha: 255 if alpha else 0)
+    return texture, mask
+
+
+@dataclass(frozen=True)
+class WaveBand:
+    """A band filled from ``base + amp * sin(x * freq + phase)`` down to the bottom of the canvas, in 1x units."""
+
+    base: float
+    amp: float
+    freq: float
+    phase: float
+    colour: tuple[int, int, int, int]
+
+
+@profiled('waves')
+def wave_bands(size: tuple[int, int], bands: list[WaveBand], softness: float, scale: float = 1) -> Image.Image:
+    """Return a transparent RGBA layer with every band blended in one float32 pass.
+
+    Each band's coverage is the normal CDF of a pixel's distance below its
+    curve, measured across the edge in units of ``softness`` pixels, which is
+    what a Gaussian blur of that standard deviation makes of a hard edge. No
+    polygon is rasterized or blurred. As in a blurred straight-alpha layer,
+    colour fades with coverage, so band edges darken slightly.
+    """
+    profile_count('layers')
+    width, height = size
+    xs = (np.arange(width, dtype=np.float32) + np.float32(0.5)) / np.float32(scale)
+    ys = np.arange(height, dtype=np.float32)[:, None] + np.float32(0.5)
+    pixels, pixels_handle = SCRATCH_POOL.take((4, height, width))
+    planes, planes_handle = SCRATCH_POOL.take((3, height, width))
+    pixels.fill(0)
+    for band in bands:
+        angle = xs * np.float32(band.freq) + np.float32(band.phase)
+        edge = (np.float32(band.base) + np.float32(band.amp) * np.sin(angle)) * np.float32(scale)
+        slope = np.float32(band.amp * band.freq) * np.cos(angle)
+        across = np.float32(1 / softness) / np.sqrt(1 + slope * slope)
+        # Rows more than four deviations above the curve are left untouched.
+        top = max(0, int(edge.min() - 4 * softness))
+        coverage, alpha, term = planes[:, top:]
+        np.subtract(ys[top:], edge, out=coverage)
+        coverage *= across
+        # Logistic approximation of the normal CDF, within 2e-4 of it.
+        np.multiply(coverage, coverage, out=term)
+        term *= np.float32(0.044715)
+        term += 1
+        term *= coverage
+        term *= np.float32(math.sqrt(2 / math.pi))
+        np.tanh(term, out=coverage)
+        coverage += 1
+        coverage *= np.float32(0.5)
+
+        np.multiply(coverage, np.float32(band.colour[3] / 255), out=alpha)
+        region = pixels[:, top:]
+        np.subtract(np.float32(1), alpha, out=term)
+        region *= term
+        region[3] += alpha
+        alpha *= coverage
+        for channel in range(3):
+            np.multiply(alpha, np.float32(band.colour[channel] / 255), out=term)
+            region[channel] += term
+
+    quantized = np.empty((height, width, 4), dtype=np.uint8)
+    quantize_planes(pixels, planes[0], quantized)
+    SCRATCH_POOL.give(pixels_handle)
+    SCRATCH_POOL.give(planes_handle)
+    return Image.fromarray(quantized, 'RGBA')
+
+
+@register_style('mesh-gradient', description='Soft colour blobs blurred over a faint grid')
+def background_mesh_gradient(rnd: random.Random, scale: float = 1) -> list:
     palette = [
         (80, 120, 255),
         (150, 90, 240),
@@ -155,28 +1505,31 @@ def style_mesh_gradient(title: str, subtitle: str, output_path: Path, rnd: rando
         (255, 120, 90),
         (110, 240, 160),
     ]
+    graph = [Fill((18, 20, 45, 255))]
 
     for _ in range(9):
-        layer = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(layer, 'RGBA')
         cx = rnd.randint(80, WIDTH - 80)
         cy = rnd.randint(60, HEIGHT - 60)
         radius = rnd.randint(90, 220)
         colour = rnd.choice(palette)
-        for r in range(radius, 8, -6):
-            alpha = max(0, int(130 * (r / radius) ** 1.7))
-            draw.ellipse((cx - r, cy - r, cx + r, cy + r), fill=(*colour, alpha))
-        layer = layer.filter(ImageFilter.GaussianBlur(28))
-        img.alpha_composite(layer)
-
-    grid = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-    gdraw = ImageDraw.Draw(grid, 'RGBA')
-    for x in range(0, WIDTH, 32):
-        gdraw.line([(x, 0), (x, HEIGHT)], fill=(255, 255, 255, 18), width=1)
-    for y in range(0, HEIGHT, 32):
-        gdraw.line([(0, y), (WIDTH, y)], fill=(255, 255, 255, 18), width=1)
-    img.alpha_composite(grid)
 
+        def paint_blob(draw, origin, layer_scale, cx=cx, cy=cy, radius=radius, colour=colour):
+            unit = scale * layer_scale
+            x, y = (cx * scale - origin[0]) * layer_scale, (cy * scale - origin[1]) * layer_scale
+            for r in range(radius, 8, -6):
+                alpha = max(0, int(130 * (r / radius) ** 1.7))
+                draw.ellipse((x - r * unit, y - r * unit, x + r * unit, y + r * unit), fill=(*colour, alpha))
+
+        bbox = scale_box((cx - radius, cy - radius, cx + radius + 1, cy + radius + 1), scale)
+        graph.append(Layer(paint_blob, bbox, blur=28 * scale, soft=True))
+
+    grid = GridLines(32, (255, 255, 255, 18))
+    graph.append(Blend(lambda size: line_texture(scale, grid, grid)[0]))
+    return graph
+
+
+@style_text('mesh-gradient')
+def text_mesh_gradient(img: Image.Image, title: str, subtitle: str) -> Image.Image:
     draw_centered_text(
         img,
         title,
@@ -185,32 +1538,32 @@ def style_mesh_gradient(title: str, subtitle: str, output_path: Path, rnd: rando
         subtitle_fill=(224, 236, 255, 245),
         glow_fill=(210, 230, 255, 120),
     )
+    return ImageEnhance.Contrast(img).enhance(1.08)
 
-    img = ImageEnhance.Contrast(img).enhance(1.08)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(output_path, 'PNG')
-
-
-def style_blueprint(title: str, subtitle: str, output_path: Path, rnd: random.Random) -> None:
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (12, 36, 74, 255))
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    for x in range(0, WIDTH, 25):
-        alpha = 24 if x % 100 else 45
-        draw.line([(x, 0), (x, HEIGHT)], fill=(160, 205, 255, alpha), width=1)
-    for y in range(0, HEIGHT, 25):
-        alpha = 24 if y % 100 else 45
-        draw.line([(0, y), (WIDTH, y)], fill=(160, 205, 255, alpha), width=1)
 
+@register_style('blueprint', description='Blueprint grid with outlined rectangles', flat=True, chrome=True)
+def background_blueprint(rnd: random.Random, scale: float = 1, width: float = WIDTH) -> list:
+    boxes = []
     for _ in range(12):
-        x1 = rnd.randint(50, WIDTH - 220)
+        x1 = rnd.randint(50, max(50, int(width) - 220))
         y1 = rnd.randint(40, HEIGHT - 120)
         x2 = x1 + rnd.randint(80, 220)
         y2 = y1 + rnd.randint(30, 120)
-        draw.rectangle((x1, y1, x2, y2), outline=(200, 230, 255, 70), width=2)
+        boxes.append((x1, y1, x2, y2))
+
+    def paint(draw):
+        for box in boxes:
+            draw.rectangle(scale_box(box, scale), outline=(200, 230, 255, 70), width=stroke(2, scale))
+
+        border = scale_box((26, 26, width - 26, HEIGHT - 26), scale)
+        draw.rectangle(border, outline=(220, 240, 255, 120), width=stroke(3, scale))
+
+    grid = GridLines(25, (160, 205, 255, 24), major=4, major_colour=(160, 205, 255, 45))
+    return [Fill((12, 36, 74, 255)), Overlay(scale, grid, grid, width), Shapes(paint)]
 
-    draw.rectangle((26, 26, WIDTH - 26, HEIGHT - 26), outline=(220, 240, 255, 120), width=3)
 
+@style_text('blueprint')
+def text_blueprint(img: Image.Image, title: str, subtitle: str) -> Image.Image:
     draw_centered_text(
         img,
         title,
@@ -219,36 +1572,29 @@ def style_blueprint(title: str, subtitle: str, output_path: Path, rnd: random.Ra
         subtitle_fill=(198, 226, 255, 245),
         glow_fill=(120, 185, 255, 80),
     )
+    return img
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(output_path, 'PNG')
 
+@register_style('duotone-noise', description='Purple gradient with grain and faint lines')
+def background_duotone_noise(rnd: random.Random, scale: float = 1) -> list:
+    width = canvas_size(scale)[0]
+    rng = numpy_rng(rnd)
+    lines = [(rnd.randint(0, HEIGHT - 1) * scale, rnd.randint(8, 22)) for _ in range(22)]
 
-def style_duotone_noise(title: str, subtitle: str, output_path: Path, rnd: random.Random) -> None:
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (26, 16, 34, 255))
-    draw = ImageDraw.Draw(img, 'RGBA')
+    def paint(draw):
+        line_width = stroke(1, scale)
+        for y, alpha in lines:
+            draw.line([(0, y), (width, y)], fill=(255, 255, 255, alpha), width=line_width)
+
+    return [
+        Gradient(((35, 15, 50), (130, 45, 165))),
+        Blend(lambda size: grain_layer(size, rng, density=14000 / (WIDTH * HEIGHT))),
+        Shapes(paint),
+    ]
 
-    for y in range(HEIGHT):
-        t = y / max(HEIGHT - 1, 1)
-        r = int(35 + (130 - 35) * t)
-        g = int(15 + (45 - 15) * t)
-        b = int(50 + (165 - 50) * t)
-        draw.line([(0, y), (WIDTH, y)], fill=(r, g, b, 255), width=1)
-
-    noise_layer = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-    ndraw = ImageDraw.Draw(noise_layer, 'RGBA')
-    for _ in range(14000):
-        x = rnd.randint(0, WIDTH - 1)
-        y = rnd.randint(0, HEIGHT - 1)
-        shade = rnd.randint(160, 255)
-        alpha = rnd.randint(10, 38)
-        ndraw.point((x, y), fill=(shade, shade, shade, alpha))
-    img.alpha_composite(noise_layer)
-
-    for _ in range(22):
-        y = rnd.randint(0, HEIGHT - 1)
-        draw.line([(0, y), (WIDTH, y)], fill=(255, 255, 255, rnd.randint(8, 22)), width=1)
 
+@style_text('duotone-noise')
+def text_duotone_noise(img: Image.Image, title: str, subtitle: str) -> Image.Image:
     draw_centered_text(
         img,
         title,
@@ -257,38 +1603,26 @@ def style_duotone_noise(title: str, subtitle: str, output_path: Path, rnd: rando
         subtitle_fill=(238, 215, 240, 245),
         glow_fill=(255, 190, 228, 100),
     )
+    return img
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(output_path, 'PNG')
-
-
-def style_sunset_waves(title: str, subtitle: str, output_path: Path, rnd: random.Random) -> None:
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (14, 21, 56, 255))
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    for y in range(HEIGHT):
-        t = y / max(HEIGHT - 1, 1)
-        r = int(20 + (250 - 20) * t)
-        g = int(40 + (120 - 40) * t)
-        b = int(95 + (90 - 95) * t)
-        draw.line([(0, y), (WIDTH, y)], fill=(r, g, b, 255), width=1)
 
+@register_style('sunset-waves', description='Blurred layered waves over a dusk gradient', animated=True)
+def background_sunset_waves(rnd: random.Random, scale: float = 1, phase: float = 0) -> list:
+    bands = []
     for i in range(8):
-        layer = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-        ldraw = ImageDraw.Draw(layer, 'RGBA')
-        base_y = 40 + i * 50
         amp = rnd.randint(10, 22)
         freq = rnd.uniform(0.007, 0.017)
-        points = []
-        for x in range(0, WIDTH + 10, 10):
-            y = int(base_y + amp * math.sin(x * freq + i * 0.8))
-            points.append((x, y))
-        points.extend([(WIDTH, HEIGHT), (0, HEIGHT)])
         colour = (255, 180 - i * 12, 120 + i * 10, max(28, 90 - i * 7))
-        ldraw.polygon(points, fill=colour)
-        layer = layer.filter(ImageFilter.GaussianBlur(6))
-        img.alpha_composite(layer)
+        # Alternate bands roll at twice the speed, so the layers drift past each other.
+        bands.append(WaveBand(40 + i * 50, amp, freq, i * 0.8 + phase * (1 + i % 2), colour))
+    return [
+        Gradient(((20, 40, 95), (250, 120, 90))),
+        Blend(lambda size: wave_bands(size, bands, softness=6 * scale, scale=scale)),
+    ]
 
+
+@style_text('sunset-waves')
+def text_sunset_waves(img: Image.Image, title: str, subtitle: str) -> Image.Image:
     draw_centered_text(
         img,
         title,
@@ -297,27 +1631,33 @@ def style_sunset_waves(title: str, subtitle: str, output_path: Path, rnd: random
         subtitle_fill=(255, 232, 210, 245),
         glow_fill=(255, 210, 170, 120),
     )
+    return img
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(output_path, 'PNG')
-
-
-def style_minimal_paper(title: str, subtitle: str, output_path: Path, rnd: random.Random) -> None:
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (242, 235, 223, 255))
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    for y in range(HEIGHT):
-        alpha = rnd.randint(8, 18)
-        draw.line([(0, y), (WIDTH, y)], fill=(140, 125, 108, alpha), width=1)
 
+@register_style('minimal-paper', description='Lined warm paper with muted ellipses', flat=True)
+def background_minimal_paper(rnd: random.Random, scale: float = 1) -> list:
+    width = canvas_size(scale)[0]
+    rows = [rnd.randint(8, 18) for _ in range(HEIGHT)]
     accents = [(185, 120, 90, 110), (108, 130, 154, 100), (128, 145, 108, 100)]
+    shapes = []
     for _ in range(6):
         x1 = rnd.randint(-80, WIDTH - 120)
         y1 = rnd.randint(-40, HEIGHT - 80)
         x2 = x1 + rnd.randint(160, 300)
         y2 = y1 + rnd.randint(80, 180)
-        draw.ellipse((x1, y1, x2, y2), fill=rnd.choice(accents))
+        shapes.append(((x1, y1, x2, y2), rnd.choice(accents)))
 
+    def paint(draw):
+        for y, alpha in enumerate(rows):
+            draw.rectangle((0, y * scale, width, (y + 1) * scale - 1), fill=(140, 125, 108, alpha))
+        for box, colour in shapes:
+            draw.ellipse(scale_box(box, scale), fill=colour)
+
+    return [Fill((242, 235, 223, 255)), Shapes(paint)]
+
+
+@style_text('minimal-paper')
+def text_minimal_paper(img: Image.Image, title: str, subtitle: str) -> Image.Image:
     draw_centered_text(
         img,
         title,
@@ -326,35 +1666,36 @@ def style_minimal_paper(title: str, subtitle: str, output_path: Path, rnd: rando
         subtitle_fill=(88, 74, 62, 245),
         glow_fill=None,
     )
+    return img
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(output_path, 'PNG')
-
-
-def style_neon_grid(title: str, subtitle: str, output_path: Path, rnd: random.Random) -> None:
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (8, 10, 24, 255))
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    for y in range(HEIGHT):
-        t = y / max(HEIGHT - 1, 1)
-        draw.line(
-            [(0, y), (WIDTH, y)],
-            fill=(int(10 + 35 * t), int(12 + 20 * t), int(35 + 80 * t), 255),
-            width=1,
-        )
-
-    for x in range(0, WIDTH, 32):
-        draw.line([(x, 0), (x, HEIGHT)], fill=(50, 235, 255, 42), width=1)
-    for y in range(0, HEIGHT, 32):
-        draw.line([(0, y), (WIDTH, y)], fill=(220, 75, 255, 32), width=1)
 
-    for _ in range(20):
+@register_style('neon-grid', description='Neon grid and light streaks on a violet gradient', animated=True)
+def background_neon_grid(rnd: random.Random, scale: float = 1, phase: float = 0) -> list:
+    streaks = []
+    for index in range(20):
         x1 = rnd.randint(0, WIDTH - 1)
         y1 = rnd.randint(0, HEIGHT - 1)
         x2 = x1 + rnd.randint(-220, 220)
         y2 = y1 + rnd.randint(-120, 120)
-        draw.line([(x1, y1), (x2, y2)], fill=(120, 255, 220, 50), width=2)
+        # Streaks glide up to 18px along themselves and back, neighbours in opposite directions.
+        glide = 18 * math.sin(phase) * (-1) ** index / max(1, math.hypot(x2 - x1, y2 - y1))
+        dx, dy = (x2 - x1) * glide, (y2 - y1) * glide
+        streaks.append((x1 + dx, y1 + dy, x2 + dx, y2 + dy))
+
+    def paint(draw):
+        for streak in streaks:
+            draw.line(scale_box(streak, scale), fill=(120, 255, 220, 50), width=stroke(2, scale))
+
+    vertical, horizontal = GridLines(32, (50, 235, 255, 42)), GridLines(32, (220, 75, 255, 32))
+    return [
+        Gradient(((10, 12, 35), (45, 32, 115))),
+        Overlay(scale, vertical, horizontal),
+        Shapes(paint),
+    ]
+
 
+@style_text('neon-grid')
+def text_neon_grid(img: Image.Image, title: str, subtitle: str) -> Image.Image:
     draw_centered_text(
         img,
         title,
@@ -363,37 +1704,27 @@ def style_neon_grid(title: str, subtitle: str, output_path: Path, rnd: random.Ra
         subtitle_fill=(190, 235, 255, 245),
         glow_fill=(75, 240, 255, 140),
     )
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(output_path, 'PNG')
+    return img
 
 
-def style_aurora_mist(title: str, subtitle: str, output_path: Path, rnd: random.Random) -> None:
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (8, 20, 32, 255))
-
+@register_style('aurora-mist', description='Blurred aurora bands on a night sky', animated=True)
+def background_aurora_mist(rnd: random.Random, scale: float = 1, phase: float = 0) -> list:
     bands = [
         (70, 245, 190),
         (110, 190, 255),
         (170, 120, 255),
         (110, 255, 150),
     ]
-
+    waves = []
     for i in range(8):
-        layer = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(layer, 'RGBA')
-        colour = bands[i % len(bands)]
-        base = 40 + i * 45
         amp = rnd.randint(18, 40)
         freq = rnd.uniform(0.006, 0.012)
-        points = []
-        for x in range(0, WIDTH + 12, 12):
-            y = int(base + amp * math.sin(x * freq + i * 0.9))
-            points.append((x, y))
-        points.extend([(WIDTH, HEIGHT), (0, HEIGHT)])
-        draw.polygon(points, fill=(*colour, 55))
-        layer = layer.filter(ImageFilter.GaussianBlur(18))
-        img.alpha_composite(layer)
+        waves.append(WaveBand(40 + i * 45, amp, freq, i * 0.9 + phase * (1 + i % 2), (*bands[i % len(bands)], 55)))
+    return [Fill((8, 20, 32, 255)), Blend(lambda size: wave_bands(size, waves, softness=18 * scale, scale=scale))]
 
+
+@style_text('aurora-mist')
+def text_aurora_mist(img: Image.Image, title: str, subtitle: str) -> Image.Image:
     draw_centered_text(
         img,
         title,
@@ -402,27 +1733,30 @@ def style_aurora_mist(title: str, subtitle: str, output_path: Path, rnd: random.
         subtitle_fill=(205, 235, 255, 245),
         glow_fill=(150, 255, 225, 120),
     )
+    return img
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(output_path, 'PNG')
-
-
-def style_retro_terminal(title: str, subtitle: str, output_path: Path, rnd: random.Random) -> None:
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (10, 20, 10, 255))
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    for y in range(HEIGHT):
-        t = y / max(HEIGHT - 1, 1)
-        draw.line([(0, y), (WIDTH, y)], fill=(int(8 + 20 * t), int(30 + 60 * t), int(8 + 18 * t), 255), width=1)
 
-    for y in range(0, HEIGHT, 3):
-        draw.line([(0, y), (WIDTH, y)], fill=(0, 0, 0, 26), width=1)
-
-    mono_font = find_font(16)
+@register_style('retro-terminal', description='Green-screen terminal with scan lines and commands', chrome=True)
+def background_retro_terminal(rnd: random.Random, scale: float = 1, width: float = WIDTH) -> list:
     snippets = ['> build', '> deploy', '> test --all', '> analyse logs', '> status ok']
-    for i in range(9):
-        draw.text((24, 18 + i * 22), rnd.choice(snippets), font=mono_font, fill=(120, 255, 140, 80))
+    commands = [rnd.choice(snippets) for _ in range(9)]
+
+    def paint(draw):
+        mono_font = find_font(scaled(16, scale), 'mono')
+        for i, command in enumerate(commands):
+            xy = (scaled(24, scale), scaled(18 + i * 22, scale))
+            draw_text(draw, xy, command, mono_font, (120, 255, 140, 80))
+
+    scanlines = GridLines(3, (0, 0, 0, 26))
+    return [
+        Gradient(((8, 30, 8), (28, 90, 26))),
+        Overlay(scale, horizontal=scanlines, width=width),
+        Shapes(paint),
+    ]
 
+
+@style_text('retro-terminal')
+def text_retro_terminal(img: Image.Image, title: str, subtitle: str) -> Image.Image:
     draw_centered_text(
         img,
         title,
@@ -431,120 +1765,142 @@ def style_retro_terminal(title: str, subtitle: str, output_path: Path, rnd: rand
         subtitle_fill=(165, 225, 160, 245),
         glow_fill=(120, 255, 130, 95),
     )
+    return img
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(output_path, 'PNG')
-
-
-def style_copilot_terminal(title: str, subtitle: str, output_path: Path, rnd: random.Random) -> None:
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (12, 18, 28, 255))
-    draw = ImageDraw.Draw(img, 'RGBA')
-
-    for y in range(HEIGHT):
-        t = y / max(HEIGHT - 1, 1)
-        r = int(12 + 18 * t)
-        g = int(20 + 44 * t)
-        b = int(28 + 34 * t)
-        draw.line([(0, y), (WIDTH, y)], fill=(r, g, b, 255), width=1)
 
+@register_style('copilot-terminal', description='Copilot CLI terminal window with command history', chrome=True)
+def background_copilot_terminal(rnd: random.Random, scale: float = 1, width: float = WIDTH) -> list:
+    canvas_width, canvas_height = canvas_size(scale, width)
+    accents = []
     for _ in range(3):
-        x1 = rnd.randint(-120, WIDTH - 120)
+        x1 = rnd.randint(-120, int(width) - 120)
         y1 = rnd.randint(-80, HEIGHT - 60)
         x2 = x1 + rnd.randint(140, 320)
         y2 = y1 + rnd.randint(90, 200)
         colour = rnd.choice([(72, 195, 255, 10), (95, 255, 185, 8), (140, 150, 255, 7)])
-        draw.ellipse((x1, y1, x2, y2), fill=colour)
+        accents.append(((x1, y1, x2, y2), colour))
+
+    def paint_terminal(draw):
+        for box, colour in accents:
+            draw.ellipse(scale_box(box, scale), fill=colour)
+
+        # Add a soft wash so background accents stay present but much more faded.
+        draw.rectangle((0, 0, canvas_width, canvas_height), fill=(8, 14, 22, 70))
+
+        terminal_box = scale_box((56, 44, width - 56, HEIGHT - 40), scale)
+        draw.rounded_rectangle(
+            terminal_box,
+            radius=scaled(20, scale),
+            fill=(14, 24, 34, 234),
+            outline=(120, 225, 255, 78),
+            width=stroke(2, scale),
+        )
 
-    # Add a soft wash so background accents stay present but much more faded.
-    draw.rectangle((0, 0, WIDTH, HEIGHT), fill=(8, 14, 22, 70))
+        top_bar = scale_box((56, 44, width - 56, 82), scale)
+        draw.rounded_rectangle(
+            top_bar,
+            radius=scaled(20, scale),
+            fill=(24, 36, 48, 255),
+            outline=(120, 225, 255, 55),
+            width=stroke(1, scale),
+        )
+        draw.rectangle(scale_box((56, 62, width - 56, 82), scale), fill=(24, 36, 48, 255))
+
+        for index, colour in enumerate(((255, 92, 92), (255, 194, 70), (78, 228, 120))):
+            cx = 84 + index * 24
+            cy = 63
+            draw.ellipse(scale_box((cx - 6, cy - 6, cx + 6, cy + 6), scale), fill=(*colour, 235))
+
+        mono_font = find_font(scaled(18, scale), 'mono')
+        small_font = find_font(scaled(16, scale), 'mono')
+
+        prompt_lines = [
+            '$ copilot plugin marketplace list',
+            '$ copilot plugin marketplace browse awesome-copilot',
+            '$ copilot plugin install microsoft-docs@awesome-copilot',
+            '$ copilot plugin list | grep copilot',
+        ]
+        prompt_y = 106
+        for index, line in enumerate(prompt_lines):
+            alpha = 52 if index == 0 else 36
+            draw_text(draw, (scaled(92, scale), scaled(prompt_y, scale)), line, mono_font, (128, 255, 176, alpha))
+            prompt_y += 22
+
+        ascii_lines = [
+            '+----------------------+ ',
+            '|  copilot-cli ready   |',
+            '|  plugins: enabled    |',
+            '+----------------------+ ',
+        ]
+        ascii_y = 196
+        for line in ascii_lines:
+            draw_text(draw, (scaled(94, scale), scaled(ascii_y, scale)), line, small_font, (186, 238, 255, 46))
+            ascii_y += 17
 
-    terminal_box = (56, 44, WIDTH - 56, HEIGHT - 40)
-    draw.rounded_rectangle(terminal_box, radius=20, fill=(14, 24, 34, 234), outline=(120, 225, 255, 78), width=2)
+    # Soft mask behind the main heading area to separate it from terminal text.
+    centre_box = scale_box((170, 130, width - 170, 380), scale)
 
-    top_bar = (56, 44, WIDTH - 56, 82)
-    draw.rounded_rectangle(top_bar, radius=20, fill=(24, 36, 48, 255), outline=(120, 225, 255, 55), width=1)
-    draw.rectangle((56, 62, WIDTH - 56, 82), fill=(24, 36, 48, 255))
+    def paint_centre_mask(draw, origin, layer_scale):
+        left, top, right, bottom = centre_box
+        draw.ellipse((left - origin[0], top - origin[1], right - origin[0], bottom - origin[1]), fill=(8, 18, 30, 122))
 
-    for index, colour in enumerate(((255, 92, 92), (255, 194, 70), (78, 228, 120))):
-        cx = 84 + index * 24
-        cy = 63
-        draw.ellipse((cx - 6, cy - 6, cx + 6, cy + 6), fill=(*colour, 235))
+    mask_bbox = (centre_box[0], centre_box[1], centre_box[2] + 1, centre_box[3] + 1)
+    return [
+        Gradient(((12, 20, 28), (30, 64, 62))),
+        Shapes(paint_terminal),
+        Layer(paint_centre_mask, mask_bbox, blur=16 * scale),
+    ]
 
-    mono_font = find_font(18)
-    small_font = find_font(16)
-    title_font = find_font(40)
-    subtitle_font = find_font(20)
 
-    prompt_lines = [
-        '$ copilot plugin marketplace list',
-        '$ copilot plugin marketplace browse awesome-copilot',
-        '$ copilot plugin install microsoft-docs@awesome-copilot',
-        '$ copilot plugin list | grep copilot',
-    ]
-    prompt_y = 106
-    for index, line in enumerate(prompt_lines):
-        alpha = 52 if index == 0 else 36
-        draw.text((92, prompt_y), line, font=mono_font, fill=(128, 255, 176, alpha))
-        prompt_y += 22
-
-    ascii_lines = [
-        '+----------------------+ ',
-        '|  copilot-cli ready   |',
-        '|  plugins: enabled    |',
-        '+----------------------+ ',
-    ]
-    ascii_y = 196
-    for line in ascii_lines:
-        draw.text((94, ascii_y), line, font=small_font, fill=(186, 238, 255, 46))
-        ascii_y += 17
+@style_text('copilot-terminal')
+def text_copilot_terminal(img: Image.Image, title: str, subtitle: str) -> Image.Image:
+    draw = ImageDraw.Draw(img, 'RGBA')
+    scale = canvas_scale(img)
+    small_font = find_font(scaled(16, scale))
+    subtitle_font = find_font(scaled(20, scale))
 
-    # Soft mask behind the main heading area to separate it from terminal text.
-    centre_mask = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-    mdraw = ImageDraw.Draw(centre_mask, 'RGBA')
-    mdraw.ellipse((170, 130, 830, 380), fill=(8, 18, 30, 122))
-    centre_mask = centre_mask.filter(ImageFilter.GaussianBlur(16))
-    img.alpha_composite(centre_mask)
-
-    title_lines = wrap_text(draw, title, title_font, 700)
-    title_height = sum(measure(draw, line, title_font)[1] for line in title_lines) + max(0, len(title_lines) - 1) * 6
-    subtitle_lines = wrap_text(draw, subtitle, subtitle_font, 760)
-    subtitle_height = sum(measure(draw, line, subtitle_font)[1] for line in subtitle_lines) + max(0, len(subtitle_lines) - 1) * 4
-    total_height = title_height + 16 + subtitle_height
-    y = 154 + max(0, (186 - total_height) // 2)
-
-    for line in title_lines:
-        width, line_height = measure(draw, line, title_font)
-        x = (WIDTH - width) // 2
-        glow = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-        gdraw = ImageDraw.Draw(glow, 'RGBA')
-        gdraw.text((x, y), line, font=title_font, fill=(158, 255, 210, 105))
-        glow = glow.filter(ImageFilter.GaussianBlur(10))
-        img.alpha_composite(glow)
-        draw.text((x + 2, y + 2), line, font=title_font, fill=(0, 0, 0, 150))
-        draw.text((x, y), line, font=title_font, fill=(212, 255, 228, 255))
-        y += line_height + 6
-
-    y += 8
-    for line in subtitle_lines:
-        width, line_height = measure(draw, line, subtitle_font)
-        x = (WIDTH - width) // 2
-        draw.text((x + 1, y + 1), line, font=subtitle_font, fill=(0, 0, 0, 110))
-        draw.text((x, y), line, font=subtitle_font, fill=(202, 242, 226, 245))
-        y += line_height + 4
+    title_layout = fit_text_layout(
+        title,
+        scaled(40, scale),
+        min(scaled(700, scale), img.width - scaled(300, scale)),
+        TITLE_MAX_LINES,
+        min_size=scaled(30, scale),
+        spacing=scaled(6, scale),
+    )
+    subtitle_layout = layout_text(subtitle, subtitle_font, img.width - scaled(240, scale), spacing=scaled(4, scale))
+    title_font = title_layout.font
+    total_height = title_layout.height + scaled(16, scale) + subtitle_layout.height
+    top = scaled(154, scale) + max(0, (scaled(186, scale) - total_height) // 2)
+
+    shadow = scaled(2, scale)
+    for line, (x, y) in zip(title_layout.lines, title_layout.positions(0, img.width, top)):
+        composite_text_glow(img, (x, y), line, title_font, (158, 255, 210, 105), 10 * scale)
+        draw_text(draw, (x + shadow, y + shadow), line, title_font, (0, 0, 0, 150))
+        draw_text(draw, (x, y), line, title_font, (212, 255, 228, 255))
+
+    top += title_layout.height + scaled(14, scale)
+    shadow = scaled(1, scale)
+    for line, (x, y) in zip(subtitle_layout.lines, subtitle_layout.positions(0, img.width, top)):
+        draw_text(draw, (x + shadow, y + shadow), line, subtitle_font, (0, 0, 0, 110))
+        draw_text(draw, (x, y), line, subtitle_font, (202, 242, 226, 245))
 
     footer = 'install  build  share'
     fw, fh = measure(draw, footer, small_font)
-    draw.rounded_rectangle((WIDTH // 2 - fw // 2 - 14, HEIGHT - 84, WIDTH // 2 + fw // 2 + 14, HEIGHT - 50), radius=14, fill=(16, 26, 36, 215), outline=(120, 225, 255, 52), width=1)
-    draw.text((WIDTH // 2 - fw // 2, HEIGHT - 74), footer, font=small_font, fill=(128, 255, 176, 215))
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(output_path, 'PNG')
-
+    centre, bottom = img.width // 2, img.height
+    pad = scaled(14, scale)
+    draw.rounded_rectangle(
+        (centre - fw // 2 - pad, bottom - scaled(84, scale), centre + fw // 2 + pad, bottom - scaled(50, scale)),
+        radius=scaled(14, scale),
+        fill=(16, 26, 36, 215),
+        outline=(120, 225, 255, 52),
+        width=stroke(1, scale),
+    )
+    draw_text(draw, (centre - fw // 2, bottom - scaled(74, scale)), footer, small_font, (128, 255, 176, 215))
+    return img
 
-def style_geometric_collage(title: str, subtitle: str, output_path: Path, rnd: random.Random) -> None:
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (22, 25, 34, 255))
-    draw = ImageDraw.Draw(img, 'RGBA')
 
+@register_style('geometric-collage', description='Overlapping translucent shapes and lines')
+def background_geometric_collage(rnd: random.Random, scale: float = 1) -> list:
     palette = [
         (255, 110, 90, 120),
         (95, 180, 255, 120),
@@ -553,6 +1909,7 @@ def style_geometric_collage(title: str, subtitle: str, output_path: Path, rnd: r
         (90, 220, 180, 110),
     ]
 
+    shapes = []
     for _ in range(28):
         shape = rnd.choice(['rect', 'tri', 'circle'])
         colour = rnd.choice(palette)
@@ -561,23 +1918,36 @@ def style_geometric_collage(title: str, subtitle: str, output_path: Path, rnd: r
         size = rnd.randint(50, 180)
 
         if shape == 'rect':
-            draw.rectangle((x, y, x + size, y + int(size * rnd.uniform(0.4, 1.1))), fill=colour)
+            shapes.append(('rect', (x, y, x + size, y + int(size * rnd.uniform(0.4, 1.1))), colour))
         elif shape == 'circle':
-            draw.ellipse((x, y, x + size, y + size), fill=colour)
+            shapes.append(('circle', (x, y, x + size, y + size), colour))
         else:
             points = [(x, y), (x + size, y + rnd.randint(0, size)), (x + rnd.randint(0, size), y + size)]
-            draw.polygon(points, fill=colour)
-
-    overlay = Image.new('RGBA', (WIDTH, HEIGHT), (255, 255, 255, 0))
-    odraw = ImageDraw.Draw(overlay, 'RGBA')
+            shapes.append(('tri', points, colour))
+
+    def paint_shapes(draw):
+        for shape, geometry, colour in shapes:
+            if shape == 'rect':
+                draw.rectangle(scale_box(geometry, scale), fill=colour)
+            elif shape == 'circle':
+                draw.ellipse(scale_box(geometry, scale), fill=colour)
+            else:
+                draw.polygon([(px * scale, py * scale) for px, py in geometry], fill=colour)
+
+    lines = []
     for _ in range(12):
-        odraw.line(
-            [(rnd.randint(0, WIDTH), rnd.randint(0, HEIGHT)), (rnd.randint(0, WIDTH), rnd.randint(0, HEIGHT))],
-            fill=(255, 255, 255, 35),
-            width=rnd.randint(1, 4),
-        )
-    img.alpha_composite(overlay)
+        line = (rnd.randint(0, WIDTH), rnd.randint(0, HEIGHT), rnd.randint(0, WIDTH), rnd.randint(0, HEIGHT))
+        lines.append((line, rnd.randint(1, 4)))
+
+    def paint_lines(draw, origin, layer_scale):
+        for line, width in lines:
+            draw.line(scale_box(line, scale), fill=(255, 255, 255, 35), width=stroke(width, scale))
+
+    return [Fill((22, 25, 34, 255)), Shapes(paint_shapes), Layer(paint_lines)]
 
+
+@style_text('geometric-collage')
+def text_geometric_collage(img: Image.Image, title: str, subtitle: str) -> Image.Image:
     draw_centered_text(
         img,
         title,
@@ -586,54 +1956,1889 @@ def style_geometric_collage(title: str, subtitle: str, output_path: Path, rnd: r
         subtitle_fill=(230, 235, 248, 245),
         glow_fill=(255, 255, 255, 70),
     )
+    return img
+
+
+STYLES = tuple(STYLE_REGISTRY)
+ANIMATED_STYLES = tuple(name for name, style in STYLE_REGISTRY.items() if style.animated)
+
+
+@functools.cache
+def renderer_version() -> str:
+    """Return a hash of this script, so any change to the renderer invalidates cached renders."""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+
+def _font_fingerprint() -> list:
+    fingerprint = []
+    for role in FONT_FAMILIES:
+        match = resolve_font(role)
+        if match is None:
+            fingerprint.append([role, 'default'])
+            continue
+        stat = os.stat(match[0])
+        fingerprint.append([role, match[0], match[1], stat.st_mtime_ns, stat.st_size])
+    return fingerprint
+
+
+@dataclass(frozen=True)
+class SavedImage:
+    """One encoded output file and what it cost to write."""
+
+    path: Path
+    size: tuple[int, int]
+    bytes: int
+    seconds: float
+    cached: bool = False
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    style: str
+    images: tuple[SavedImage, ...]
+
+
+@dataclass(frozen=True)
+class EncodedImage:
+    """One encoded cover held in memory and what it cost to encode."""
+
+    size: tuple[int, int]
+    data: bytes
+    seconds: float
+    cached: bool = False
+
+
+def image_format(path: Path | str) -> str:
+    """Return the Pillow format for a path or bare suffix such as ``webp``; unknown suffixes are an error."""
+    suffix = path.suffix if isinstance(path, Path) else f'.{path.lstrip(".")}'
+    fmt = IMAGE_FORMATS.get(suffix.lower())
+    if fmt is None:
+        suffixes = ', '.join(IMAGE_FORMATS)
+        raise ValueError(f'Covers are written as {suffixes}, not {suffix.strip(".") and suffix or "no suffix"}')
+    Image.init()
+    if fmt not in Image.SAVE:
+        raise ValueError(f'This Pillow build cannot write {fmt} files')
+    return fmt
+
+
+def composite_opaque(img: Image.Image) -> Image.Image:
+    """Return ``img`` as RGB, alpha-composited onto :data:`OPAQUE_BASE` rather than stripped of its alpha."""
+    if img.mode != 'RGBA':
+        return img.convert('RGB')
+    return Image.alpha_composite(Image.new('RGBA', img.size, (*OPAQUE_BASE, 255)), img).convert('RGB')
+
+
+def encode_bytes(img: Image.Image, fmt: str, encoding: EncodeOptions, flat: bool = False) -> bytes:
+    """Encode ``img`` as ``fmt`` in memory.
+
+    An alpha channel that is fully opaque is dropped when ``encoding.flatten``
+    is set, which is lossless. Palette quantization only applies to PNG, where
+    it roughly halves flat covers at the cost of faint texture.
+    """
+    if encoding.flatten and img.mode == 'RGBA' and img.getextrema()[3] == (255, 255):
+        img = img.convert('RGB')
+    buffer = io.BytesIO()
+    if fmt == 'PNG':
+        if encoding.palette == 'always' or (encoding.palette == 'flat' and flat):
+            method = Image.FASTOCTREE if img.mode == 'RGBA' else Image.MEDIANCUT
+            img = img.quantize(encoding.colors, method=method)
+        img.save(buffer, 'PNG', compress_level=encoding.compress_level, optimize=encoding.optimize)
+    elif fmt == 'WEBP':
+        img.save(buffer, 'WEBP', quality=encoding.quality, lossless=encoding.lossless)
+    elif fmt == 'JPEG':
+        # JPEG has no alpha channel, and dropping it would turn translucent grid lines and shadows solid.
+        composite_opaque(img).save(buffer, 'JPEG', quality=encoding.quality)
+    else:
+        img.save(buffer, fmt, quality=encoding.quality)
+    return buffer.getvalue()
+
+
+@dataclass(frozen=True)
+class RenderCache:
+    """Content-addressed image cache with a cover tier and a text-free background tier.
+
+    Entries are evicted least recently used first once the cache grows past
+    ``max_bytes``; a hit refreshes the entry's mtime. Each process keeps a
+    running estimate of the cache size from its last scan plus what it wrote
+    since, and only scans the folders again once that estimate crosses the limit.
+    """
+
+    root: Path
+    max_bytes: int = DEFAULT_CACHE_SIZE_MB * 1024 * 1024
+    usage: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @staticmethod
+    def key(**fields) -> str:
+        payload = json.dumps(fields, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, tier: str, key: str, suffix: str = '.png') -> Path:
+        return self.root / tier / f'{key}{suffix}'
+
+    def get(self, tier: str, key: str, suffix: str = '.png') -> Path | None:
+        path = self._path(tier, key, suffix)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put(self, tier: str, key: str, source: Image.Image | bytes, suffix: str = '.png') -> None:
+        path = self._path(tier, key, suffix)
+        temp_path = path.with_name(f'{path.stem}.{os.getpid()}.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(source, bytes):
+                temp_path.write_bytes(source)
+            else:
+                # Cache entries favour encode speed over size.
+                source.save(temp_path, 'PNG', compress_level=1)
+            written = temp_path.stat().st_size
+            os.replace(temp_path, path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            return
+        estimate = self.usage.get('bytes')
+        if estimate is None or estimate + written > self.max_bytes:
+            self.evict()
+        else:
+            self.usage['bytes'] = estimate + written
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(output_path, 'PNG')
+    def evict(self) -> None:
+        entries = []
+        for tier in CACHE_TIERS:
+            folder = self.root / tier
+            if not folder.is_dir():
+                continue
+            for path in folder.iterdir():
+                if path.suffix == '.tmp':
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self.usage['bytes'] = total
+
+
+def parse_output_size(name: str) -> tuple[int, int]:
+    """Resolve a named output size from ``OUTPUT_SIZES`` or a literal ``WIDTHxHEIGHT``."""
+    if name in OUTPUT_SIZES:
+        return OUTPUT_SIZES[name]
+    width, sep, height = name.lower().partition('x')
+    if sep and width.isdigit() and height.isdigit() and int(width) > 0 and int(height) > 0:
+        return int(width), int(height)
+    raise ValueError(f'Unknown output size {name!r}: use one of {", ".join(OUTPUT_SIZES)} or WIDTHxHEIGHT')
+
+
+def output_path_for(base: Path, size_name: str) -> Path:
+    """Return where a named size is written next to the main ``cover`` output."""
+    if size_name == 'cover':
+        return base
+    suffix = size_name[len('cover'):] if size_name.startswith('cover') else f'-{size_name}'
+    return base.with_name(f'{base.stem}{suffix}{base.suffix}')
+
+
+def background_plan(
+    cover_style: CoverStyle, sizes: dict[str, tuple[int, int]]
+) -> dict[tuple[int, float], dict[str, tuple[int, int]]]:
+    """Group sizes by the background they are fitted from, keyed by its design width and scale.
+
+    Chrome styles are laid out again at every aspect ratio so their frames stay
+    on the canvas; the others are drawn at the cover width and letterboxed.
+    Each scale is the smallest that fills every size in its group without upscaling.
+    """
+    groups: dict[int, dict[str, tuple[int, int]]] = {}
+    for name, (width, height) in sizes.items():
+        design_width = round(HEIGHT * width / height) if cover_style.chrome else WIDTH
+        groups.setdefault(design_width, {})[name] = (width, height)
+    return {
+        (design_width, max(min(width / design_width, height / HEIGHT) for width, height in group.values())): group
+        for design_width, group in groups.items()
+    }
 
 
-def generate_cover(title: str, subtitle: str, output_path: Path, style: str, seed: int | None) -> str:
-    rnd = random.Random(seed)
-    selected_style = style
-    if selected_style == 'random':
-        selected_style = pick_weighted_style(rnd)
-
-    generators = {
-        'mesh-gradient': style_mesh_gradient,
-        'blueprint': style_blueprint,
-        'duotone-noise': style_duotone_noise,
-        'sunset-waves': style_sunset_waves,
-        'minimal-paper': style_minimal_paper,
-        'neon-grid': style_neon_grid,
-        'aurora-mist': style_aurora_mist,
-        'retro-terminal': style_retro_terminal,
-        'copilot-terminal': style_copilot_terminal,
-        'geometric-collage': style_geometric_collage,
-    }
+def fit_background(background: Image.Image, size: tuple[int, int]) -> Image.Image:
+    """Resample ``background`` to ``size``, letterboxing it in its average colour if the aspect ratios differ."""
+    if background.size == size:
+        return background.copy()
+    width, height = size
+    if abs(background.width * height / background.height - width) <= 1:
+        return background.resize(size, Image.LANCZOS)
+    factor = min(width / background.width, height / background.height)
+    inner = (max(1, round(background.width * factor)), max(1, round(background.height * factor)))
+    fill = background.resize((1, 1), Image.BOX).getpixel((0, 0))
+    img = Image.new('RGBA', size, fill)
+    img.paste(background.resize(inner, Image.LANCZOS), ((width - inner[0]) // 2, (height - inner[1]) // 2))
+    return img
+
 
-    if selected_style not in generators:
+def _background_graph(cover_style: CoverStyle, rnd: random.Random, scale: float, width: int, *args) -> list:
+    if cover_style.chrome:
+        return cover_style.background(rnd, scale, *args, width=width)
+    return cover_style.background(rnd, scale, *args)
+
+
+def _resolve_style(style: str, rnd: random.Random, animated: bool = False) -> CoverStyle:
+    selected_style = pick_weighted_style(rnd, animated) if style == 'random' else style
+    cover_style = STYLE_REGISTRY.get(selected_style)
+    if cover_style is None:
         raise ValueError(f'Unknown style: {selected_style}')
+    return cover_style
+
+
+def _render_sizes(
+    cover_style: CoverStyle,
+    rnd: random.Random,
+    title: str,
+    subtitle: str,
+    plan: dict[tuple[int, float], dict[str, tuple[int, int]]],
+    options: RenderOptions,
+    cache: RenderCache | None,
+    fields: dict,
+):
+    """Draw or load each background of ``plan`` once, then yield its sizes with their text drawn.
+
+    Every background is built from the same random state, so a chrome style
+    laid out at another aspect ratio keeps its shapes and commands.
+    """
+    state = rnd.getstate()
+    for (width, scale), sizes in plan.items():
+        background = None
+        background_key = cache.key(width=width, scale=scale, **fields) if cache is not None else ''
+        cached_background = cache.get('backgrounds', background_key) if cache is not None else None
+        if cached_background is not None:
+            # Another process may evict the entry between get() and the read.
+            with profile_span('cache'), contextlib.suppress(OSError), Image.open(cached_background) as cached:
+                background = cached.convert('RGBA')
+        if background is None:
+            rnd.setstate(state)
+            with profile_span('background'):
+                graph = _background_graph(cover_style, rnd, scale, width)
+                background = render_layers(canvas_size(scale, width), graph, options)
+            if cache is not None:
+                with profile_span('cache'):
+                    cache.put('backgrounds', background_key, background)
+
+        for name, size in sizes.items():
+            with profile_span('fit'):
+                img = fit_background(background, size)
+            with profile_span('text'):
+                img = cover_style.text(img, title, subtitle)
+            yield name, img
+
+
+def _background_fields(style: str, cover_style: CoverStyle, seed: int | None, options: RenderOptions) -> dict:
+    """Return what a background depends on besides its design width and scale; cache keys are built from it.
+
+    Fonts are included because the terminal styles draw text into their backgrounds.
+    """
+    return {
+        'requested_style': style,
+        'style': cover_style.name,
+        'seed': seed,
+        'fonts': _font_fingerprint(),
+        'blur_quality': options.blur_quality,
+        'compositing': options.compositing,
+        'version': renderer_version(),
+    }
+
 
-    generators[selected_style](title, subtitle, output_path, rnd)
-    return selected_style
+def render_images(
+    title: str,
+    subtitle: str = '',
+    style: str = 'random',
+    seed: int | None = None,
+    options: RenderOptions | None = None,
+    sizes: tuple[str, ...] = ('cover',),
+    cache: RenderCache | None = None,
+) -> tuple[str, dict[str, Image.Image]]:
+    """Render a cover in every requested size without touching the output folder.
+
+    Returns the style that was drawn and the RGBA images keyed by size name.
+    The background is drawn once per aspect ratio for chrome styles, once for
+    the others, at the scale of the largest size and resampled for the rest;
+    text is laid out and drawn per size so it stays sharp. A ``cache`` only
+    supplies and stores the backgrounds.
+    """
+    options = options or RenderOptions()
+    rnd = random.Random(seed)
+    cover_style = _resolve_style(style, rnd)
+    plan = background_plan(cover_style, {name: parse_output_size(name) for name in sizes})
+    if seed is None:
+        cache = None
+    fields = _background_fields(style, cover_style, seed, options)
+    images = dict(_render_sizes(cover_style, rnd, title, subtitle, plan, options, cache, fields))
+    return cover_style.name, {name: images[name] for name in sizes}
+
+
+def render_encoded(
+    title: str,
+    subtitle: str = '',
+    style: str = 'random',
+    seed: int | None = None,
+    options: RenderOptions | None = None,
+    sizes: tuple[str, ...] = ('cover',),
+    fmt: str = 'PNG',
+    cache: RenderCache | None = None,
+) -> tuple[str, dict[str, EncodedImage]]:
+    """Render and encode a cover in every requested size, in memory.
+
+    Returns the style that was drawn and the encoded images keyed by size
+    name. With a ``cache`` and a fixed ``seed``, an identical earlier render is
+    returned instead of redrawn, and a cover that only differs in its text
+    reuses the cached background.
+    """
+    options = options or RenderOptions()
+    encoding = options.encoding
+    rnd = random.Random(seed)
+    cover_style = _resolve_style(style, rnd)
+    targets = {name: parse_output_size(name) for name in sizes}
+    plan = background_plan(cover_style, targets)
+    suffix = next(suffix for suffix, name in IMAGE_FORMATS.items() if name == fmt)
+
+    # Unseeded renders are random by design, so there is nothing to reuse.
+    if seed is None:
+        cache = None
+
+    fields = _background_fields(style, cover_style, seed, options)
+    encoded = {}
+    pending = {}
+    cover_keys = {}
+    for (width, scale), group in plan.items():
+        for name, size in group.items():
+            if cache is not None:
+                cover_keys[name] = cache.key(
+                    title=title,
+                    subtitle=subtitle,
+                    size=size,
+                    format=fmt,
+                    encoding=encoding,
+                    width=width,
+                    scale=scale,
+                    **fields,
+                )
+                with profile_span('cache'):
+                    cached_cover = cache.get('covers', cover_keys[name], suffix)
+                if cached_cover is not None:
+                    started = time.perf_counter()
+                    try:
+                        data = cached_cover.read_bytes()
+                    except OSError:
+                        pass
+                    else:
+                        encoded[name] = EncodedImage(size, data, time.perf_counter() - started, cached=True)
+                        continue
+            pending[name] = size
+
+    if pending:
+        # Keep each pending size in its group so it is drawn at the scale its key records.
+        pending_plan = {
+            group: {name: size for name, size in sizes.items() if name in pending} for group, sizes in plan.items()
+        }
+        pending_plan = {group: sizes for group, sizes in pending_plan.items() if sizes}
+        for name, img in _render_sizes(cover_style, rnd, title, subtitle, pending_plan, options, cache, fields):
+            started = time.perf_counter()
+            with profile_span('encode'):
+                data = encode_bytes(img, fmt, encoding, flat=cover_style.flat)
+            encoded[name] = EncodedImage(img.size, data, time.perf_counter() - started)
+            if cache is not None:
+                with profile_span('cache'):
+                    cache.put('covers', cover_keys[name], data, suffix)
+    return cover_style.name, {name: encoded[name] for name in targets}
+
+
+def render_cover(
+    title: str,
+    subtitle: str = '',
+    style: str = 'random',
+    seed: int | None = None,
+    options: RenderOptions | None = None,
+    size: str = 'cover',
+) -> Image.Image:
+    """Render one cover and return it as an RGBA image."""
+    return render_images(title, subtitle, style, seed, options, (size,))[1][size]
+
+
+def render_cover_bytes(
+    title: str,
+    subtitle: str = '',
+    style: str = 'random',
+    seed: int | None = None,
+    options: RenderOptions | None = None,
+    size: str = 'cover',
+    fmt: str = 'png',
+) -> bytes:
+    """Render one cover and return it encoded as ``fmt`` (png, webp, avif or jpg)."""
+    return render_encoded(title, subtitle, style, seed, options, (size,), image_format(fmt))[1][size].data
+
+
+def generate_cover(
+    title: str,
+    subtitle: str,
+    output_path: Path,
+    style: str,
+    seed: int | None,
+    options: RenderOptions | None = None,
+    cache: RenderCache | None = None,
+    sizes: tuple[str, ...] = ('cover',),
+) -> RenderResult:
+    """Render a cover in every requested size and write it next to ``output_path``.
+
+    Sizes other than ``cover`` are written next to ``output_path`` (see
+    :func:`output_path_for`); the format follows its suffix. Rendering and
+    caching are those of :func:`render_encoded`.
+    """
+    selected_style, encoded = render_encoded(
+        title, subtitle, style, seed, options, sizes, image_format(output_path), cache
+    )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    saved = []
+    for name, image in encoded.items():
+        path = output_path_for(output_path, name)
+        started = time.perf_counter()
+        with profile_span('write'):
+            path.write_bytes(image.data)
+        seconds = image.seconds + time.perf_counter() - started
+        saved.append(SavedImage(path, image.size, len(image.data), seconds, image.cached))
+    return RenderResult(selected_style, tuple(saved))
+
+
+def animation_format(path: Path) -> str:
+    """Return the Pillow format an animated cover at ``path`` is written in, from its suffix."""
+    fmt = ANIMATION_FORMATS.get(path.suffix.lower())
+    if fmt is None:
+        suffixes = ', '.join(ANIMATION_FORMATS)
+        raise ValueError(f'Animated covers are written as {suffixes}, not {path.suffix or "no suffix"}')
+    Image.init()
+    if fmt not in Image.SAVE:
+        raise ValueError(f'This Pillow build cannot write {fmt} files')
+    return fmt
+
+
+def _png_chunks(data: bytes) -> Iterator[tuple[bytes, bytes]]:
+    offset = 8
+    while offset < len(data):
+        length, kind = struct.unpack('>I4s', data[offset:offset + 8])
+        yield kind, data[offset + 8:offset + 8 + length]
+        offset += length + 12
+
+
+def _png_chunk(kind: bytes, body: bytes) -> bytes:
+    return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+
+def _webp_chunk(kind: bytes, body: bytes) -> bytes:
+    return kind + struct.pack('<I', len(body)) + body + b'\0' * (len(body) & 1)
+
+
+class AnimationWriter:
+    """Append frames to an animated PNG, GIF or WebP file as they are rendered.
+
+    Pillow's animated writers hold every frame until the last one arrives, so
+    each frame is instead encoded on its own as a still and its image data is
+    spliced into the animated container straight away; only one frame is held
+    at a time. Frames play for ``duration`` milliseconds each and loop
+    forever. WebP files need a seekable ``stream``, since the RIFF header
+    records the file length.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        fmt: str,
+        size: tuple[int, int],
+        frames: int,
+        duration: int,
+        encoding: EncodeOptions,
+    ) -> None:
+        self.stream = stream
+        self.fmt = fmt
+        self.size = size
+        self.frames = frames
+        self.duration = duration
+        self.encoding = encoding
+        # Frames share one container header, so they share a mode. Later frames may be translucent where the
+        # first is not, so APNG and WebP always keep alpha, like the still cover; GIF frames are composited.
+        self.mode = 'RGB' if fmt == 'GIF' else 'RGBA'
+        self.written = 0
+        self.sequence = 0
+        self.start = stream.tell() if fmt == 'WEBP' else 0
+
+    def add(self, img: Image.Image) -> None:
+        if img.size != self.size:
+            raise ValueError(f'Frame is {img.width}x{img.height}, expected {self.size[0]}x{self.size[1]}')
+        if self.written == self.frames:
+            raise ValueError(f'The animation was declared with {self.frames} frame(s)')
+        img = composite_opaque(img) if self.mode == 'RGB' else img.convert('RGBA')
+        if self.fmt == 'PNG':
+            self._add_png(img)
+        elif self.fmt == 'GIF':
+            self._add_gif(img)
+        else:
+            self._add_webp(img)
+        self.written += 1
+
+    def close(self) -> None:
+        """Finish the container; every declared frame must have been added."""
+        if self.written != self.frames:
+            raise ValueError(f'The animation has {self.written} of its {self.frames} frame(s)')
+        if self.fmt == 'PNG':
+            self.stream.write(_png_chunk(b'IEND', b''))
+        elif self.fmt == 'GIF':
+            self.stream.write(b';')
+        else:
+            end = self.stream.tell()
+            self.stream.seek(self.start + 4)
+            self.stream.write(struct.pack('<I', end - self.start - 8))
+            self.stream.seek(end)
+
+    def _add_png(self, img: Image.Image) -> None:
+        buffer = io.BytesIO()
+        img.save(buffer, 'PNG', compress_level=self.encoding.compress_level, optimize=self.encoding.optimize)
+        chunks = list(_png_chunks(buffer.getvalue()))
+        if not self.written:
+            self.stream.write(b'\x89PNG\r\n\x1a\n')
+            self.stream.write(_png_chunk(b'IHDR', dict(chunks)[b'IHDR']))
+            self.stream.write(_png_chunk(b'acTL', struct.pack('>II', self.frames, 0)))
+        width, height = self.size
+        control = struct.pack('>IIIIIHHBB', self.sequence, width, height, 0, 0, self.duration, 1000, 0, 0)
+        self.stream.write(_png_chunk(b'fcTL', control))
+        self.sequence += 1
+        for kind, body in chunks:
+            if kind != b'IDAT':
+                continue
+            # The first frame doubles as the still image older viewers show.
+            if not self.written:
+                self.stream.write(_png_chunk(b'IDAT', body))
+            else:
+                self.stream.write(_png_chunk(b'fdAT', struct.pack('>I', self.sequence) + body))
+                self.sequence += 1
+
+    def _add_gif(self, img: Image.Image) -> None:
+        buffer = io.BytesIO()
+        img.quantize(self.encoding.colors, method=Image.MEDIANCUT).save(buffer, 'GIF')
+        data = buffer.getvalue()
+        flags, offset = data[10], 13
+        table = b''
+        if flags & 0x80:
+            table = data[offset:offset + (3 << ((flags & 7) + 1))]
+            offset += len(table)
+        while data[offset] == 0x21:
+            offset += 2
+            while data[offset]:
+                offset += data[offset] + 1
+            offset += 1
+        descriptor, image = bytearray(data[offset:offset + 10]), data[offset + 10:-1]
+        if not descriptor[9] & 0x80:
+            # Each frame keeps its own palette, so the global table becomes a local one.
+            descriptor[9] |= 0x80 | (flags & 7)
+            image = table + image
+        if not self.written:
+            self.stream.write(b'GIF89a' + struct.pack('<HHBBB', *self.size, 0x70, 0, 0))
+            self.stream.write(b'!\xff\x0bNETSCAPE2.0\x03\x01' + struct.pack('<H', 0) + b'\0')
+        delay = max(1, round(self.duration / 10))
+        self.stream.write(b'!\xf9\x04\x04' + struct.pack('<H', delay) + b'\0\0')
+        self.stream.write(bytes(descriptor) + image)
+
+    def _add_webp(self, img: Image.Image) -> None:
+        buffer = io.BytesIO()
+        img.save(buffer, 'WEBP', quality=self.encoding.quality, lossless=self.encoding.lossless)
+        data = buffer.getvalue()
+        chunks = []
+        offset = 12
+        while offset < len(data):
+            kind, length = data[offset:offset + 4], struct.unpack('<I', data[offset + 4:offset + 8])[0]
+            end = offset + 8 + length + (length & 1)
+            if kind in (b'ALPH', b'VP8 ', b'VP8L'):
+                chunks.append(data[offset:end])
+            offset = end
+        width, height = self.size
+        if not self.written:
+            features = 0x02 | (0x10 if self.mode == 'RGBA' else 0)
+            canvas = bytes([features, 0, 0, 0]) + (width - 1).to_bytes(3, 'little') + (height - 1).to_bytes(3, 'little')
+            self.stream.write(b'RIFF\0\0\0\0WEBP')
+            self.stream.write(_webp_chunk(b'VP8X', canvas))
+            self.stream.write(_webp_chunk(b'ANIM', bytes(4) + struct.pack('<H', 0)))
+        # Frames cover the whole canvas and replace it rather than blend over it.
+        header = bytes(6) + (width - 1).to_bytes(3, 'little') + (height - 1).to_bytes(3, 'little')
+        header += self.duration.to_bytes(3, 'little') + b'\x02'
+        self.stream.write(_webp_chunk(b'ANMF', header + b''.join(chunks)))
+
+
+def render_frame(
+    style: str,
+    state: tuple,
+    title: str,
+    subtitle: str,
+    size: tuple[int, int],
+    phase: float,
+    options: RenderOptions,
+) -> Image.Image:
+    """Render one animation frame of ``style`` at ``phase``, building its graph from the random ``state``.
+
+    The gradient and grid start, the text layout, the title glows and the
+    glyph masks are cached per process, so a frame only redraws the layers
+    that move and blits the text.
+    """
+    rnd = random.Random()
+    rnd.setstate(state)
+    cover_style = STYLE_REGISTRY[style]
+    [(width, scale)] = background_plan(cover_style, {'frame': size})
+    with profile_span('background'):
+        graph = _background_graph(cover_style, rnd, scale, width, phase)
+        background = render_layers(canvas_size(scale, width), graph, options)
+    with profile_span('fit'):
+        img = fit_background(background, size)
+    with profile_span('text'):
+        return cover_style.text(img, title, subtitle)
+
+
+def iter_frames(
+    style: str,
+    state: tuple,
+    title: str,
+    subtitle: str,
+    size: tuple[int, int],
+    frames: int,
+    options: RenderOptions,
+    workers: int = 1,
+) -> Iterator[Image.Image]:
+    """Yield the frames of a looping animation in order.
+
+    Frame ``i`` is drawn at phase ``2 * pi * i / frames``. With more than one
+    worker, frames render on a process pool at most two per worker ahead of
+    the one being consumed, so memory stays flat however many frames there are.
+    """
+    phases = [2 * math.pi * index / frames for index in range(frames)]
+    if workers <= 1 or frames <= 1:
+        for phase in phases:
+            yield render_frame(style, state, title, subtitle, size, phase, options)
+        return
+
+    font_index()
+    with ProcessPoolExecutor(max_workers=min(workers, frames)) as pool:
+        pending: list[Future] = []
+        for phase in phases:
+            pending.append(pool.submit(render_frame, style, state, title, subtitle, size, phase, options))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        while pending:
+            yield pending.pop(0).result()
+
+
+def render_animation(
+    title: str,
+    subtitle: str,
+    output_path: Path,
+    style: str = 'random',
+    seed: int | None = None,
+    options: RenderOptions | None = None,
+    frames: int = DEFAULT_FRAMES,
+    fps: float = DEFAULT_FPS,
+    size: str = 'cover',
+    workers: int = 1,
+) -> RenderResult:
+    """Render a looping animated cover and stream it to ``output_path``; see :class:`AnimationWriter`.
+
+    The format follows the suffix of ``output_path`` (see ``ANIMATION_FORMATS``).
+    ``style`` must be one of ``ANIMATED_STYLES``, and ``random`` only picks
+    among them. The first frame is the still cover for the same seed.
+    """
+    options = options or RenderOptions()
+    fmt = animation_format(output_path)
+    if frames < 1 or fps <= 0:
+        raise ValueError('An animation needs at least one frame and a positive frame rate')
+    rnd = random.Random(seed)
+    cover_style = _resolve_style(style, rnd, animated=True)
+    if not cover_style.animated:
+        raise ValueError(f'{cover_style.name} does not animate; use one of {", ".join(ANIMATED_STYLES)}')
+    target = parse_output_size(size)
+
+    started = time.perf_counter()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_name(f'{output_path.name}.{os.getpid()}.tmp')
+    try:
+        with temp_path.open('wb') as stream:
+            writer = AnimationWriter(stream, fmt, target, frames, round(1000 / fps), options.encoding)
+            state = rnd.getstate()
+            for frame in iter_frames(cover_style.name, state, title, subtitle, target, frames, options, workers):
+                with profile_span('encode'):
+                    writer.add(frame)
+            writer.close()
+        os.replace(temp_path, output_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    saved = SavedImage(output_path, target, output_path.stat().st_size, time.perf_counter() - started)
+    return RenderResult(cover_style.name, (saved,))
+
+
+def sheet_cover_path(sheet_path: Path, style: str, seed: int) -> Path:
+    """Return where a contact sheet's full-size cover for ``style`` and ``seed`` is written, next to the sheet."""
+    return sheet_path.with_name(f'{sheet_path.stem}-{style}-{seed}{sheet_path.suffix}')
+
+
+def _render_sheet_style(
+    title: str,
+    subtitle: str,
+    style: str,
+    seeds: tuple[int, ...],
+    sheet_path: Path,
+    size: str,
+    tile_size: tuple[int, int],
+    options: RenderOptions,
+    cache: RenderCache | None,
+    profile: bool = False,
+) -> list[tuple[int, SavedImage, Image.Image, dict | None]]:
+    """Render, encode and write every seed of one contact-sheet style and return each with its tile.
+
+    Seeds of a style run back to back in one process, so they share its
+    gradient and grid start and its title glows; the title layout, fonts and
+    glyph masks are shared with every other style the process renders.
+    """
+    fmt = image_format(sheet_path)
+    flat = STYLE_REGISTRY[style].flat
+    rendered = []
+    for seed in seeds:
+        with profiling() if profile else contextlib.nullcontext() as profiler:
+            with profile_span('cover'):
+                _, images = render_images(title, subtitle, style, seed, options, (size,), cache)
+                img = images[size]
+                started = time.perf_counter()
+                with profile_span('encode'):
+                    data = encode_bytes(img, fmt, options.encoding, flat=flat)
+                path = sheet_cover_path(sheet_path, style, seed)
+                with profile_span('write'):
+                    path.write_bytes(data)
+                saved = SavedImage(path, img.size, len(data), time.perf_counter() - started)
+                with profile_span('tile'):
+                    tile = img.resize(tile_size, Image.LANCZOS)
+        rendered.append((seed, saved, tile, profiler.snapshot() if profiler is not None else None))
+    return rendered
+
+
+def render_contact_sheet(
+    title: str,
+    subtitle: str,
+    output_path: Path,
+    styles: tuple[str, ...] = STYLES,
+    seeds: tuple[int, ...] = DEFAULT_SHEET_SEEDS,
+    options: RenderOptions | None = None,
+    size: str = 'cover',
+    tile_width: int = DEFAULT_SHEET_TILE_WIDTH,
+    workers: int = 1,
+    cache: RenderCache | None = None,
+    profile: str | None = None,
+) -> tuple[SavedImage, list[RenderResult]]:
+    """Render ``title`` in every style and seed, write each cover and a labelled contact sheet of them all.
+
+    The sheet goes to ``output_path`` with one row per style and one column
+    per seed; each cover is written next to it (see :func:`sheet_cover_path`)
+    in the same format. Styles render concurrently on a process pool, one
+    job per style, and tiles are pasted into the sheet as they arrive.
+    Returns the sheet and one result per style. With ``profile`` set to
+    ``text`` or ``json``, stage timings are aggregated per style and written
+    to stderr.
+    """
+    options = options or RenderOptions()
+    fmt = image_format(output_path)
+    width, height = parse_output_size(size)
+    tile_size = (tile_width, max(1, round(tile_width * height / width)))
+    gap = 16
+    label_font = find_font(14, weight=400)
+    label_height = text_bbox(label_font, 'Ag')[3] + 10
+    cell_width, cell_height = tile_size[0] + gap, tile_size[1] + label_height + gap
+    sheet = Image.new('RGBA', (gap + len(seeds) * cell_width, gap + len(styles) * cell_height), (24, 26, 32, 255))
+    draw = ImageDraw.Draw(sheet, 'RGBA')
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    saved: dict[str, list[SavedImage]] = {}
+    profiles: dict[str, dict] = {}
+
+    def place(style: str, rendered: list) -> None:
+        row = styles.index(style)
+        for seed, image, tile, snapshot in rendered:
+            left, top = gap + seeds.index(seed) * cell_width, gap + row * cell_height
+            sheet.paste(tile, (left, top))
+            draw_text(draw, (left, top + tile_size[1] + 5), f'{style}  seed {seed}', label_font, (205, 210, 222, 255))
+            saved.setdefault(style, []).append(image)
+            if snapshot is not None:
+                merge_profile(profiles.setdefault(style, {}), snapshot)
+            print(f'Saved creative cover -> {image.path} style={style} ({describe_saved(image)})')
+
+    jobs = [
+        (title, subtitle, style, seeds, output_path, size, tile_size, options, cache, profile is not None)
+        for style in styles
+    ]
+    if workers <= 1 or len(styles) <= 1:
+        for job in jobs:
+            place(job[2], _render_sheet_style(*job))
+    else:
+        # Build the on-disk font index once so workers only have to load it.
+        font_index()
+        with ProcessPoolExecutor(max_workers=min(workers, len(styles)), initializer=_warm_worker) as pool:
+            futures = {pool.submit(_render_sheet_style, *job): job[2] for job in jobs}
+            for future in as_completed(futures):
+                place(futures[future], future.result())
+
+    with profile_span('encode'):
+        data = encode_bytes(sheet, fmt, options.encoding)
+    output_path.write_bytes(data)
+    if profile is not None:
+        print_profiles(profiles, profile)
+    sheet_image = SavedImage(output_path, sheet.size, len(data), time.perf_counter() - started)
+    return sheet_image, [RenderResult(style, tuple(saved[style])) for style in styles]
+
+
+@dataclass(frozen=True)
+class CoverJob:
+    title: str
+    subtitle: str
+    output: Path
+    style: str = 'random'
+    seed: int | None = None
+    sizes: tuple[str, ...] = ('cover',)
+    post: Path | None = None
+
+
+def _parse_seed(value) -> int | None:
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'"seed" must be a whole number, not {value!r}') from None
+
+
+def parse_sizes(value) -> tuple[str, ...]:
+    """Accept output sizes as a list or a comma-separated string."""
+    if isinstance(value, str):
+        value = value.split(',')
+    return tuple(name.strip() for name in value or () if name.strip())
+
+
+def parse_seeds(value: str) -> tuple[int, ...]:
+    """Read comma-separated seeds for an argparse option, dropping repeats."""
+    try:
+        return tuple(dict.fromkeys(int(seed) for seed in value.split(',') if seed.strip()))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'seeds must be comma-separated whole numbers, not {value!r}') from None
+
+
+def _job_from_record(
+    record: dict,
+    default_style: str,
+    default_seed: int | None,
+    default_sizes: tuple[str, ...],
+) -> CoverJob:
+    title = (record.get('title') or '').strip()
+    output = (record.get('output') or '').strip()
+    if not title:
+        raise ValueError('"title" is missing or empty')
+    if not output:
+        raise ValueError('"output" is missing or empty')
+    seed = _parse_seed(record.get('seed'))
+    return CoverJob(
+        title=title,
+        subtitle=(record.get('subtitle') or '').strip(),
+        output=Path(output),
+        style=(record.get('style') or '').strip() or default_style,
+        seed=default_seed if seed is None else seed,
+        sizes=parse_sizes(record.get('sizes')) or default_sizes,
+    )
+
+
+def load_manifest(
+    path: Path,
+    default_style: str = 'random',
+    base_seed: int | None = None,
+    default_sizes: tuple[str, ...] = ('cover',),
+) -> list[CoverJob]:
+    """Read cover jobs from a JSONL or CSV manifest.
+
+    Each entry needs ``title`` and ``output``; ``subtitle``, ``style``,
+    ``seed`` and ``sizes`` are optional. Entries without a seed get
+    ``base_seed + index`` when a base seed is given so a batch stays repeatable.
+    """
+    with path.open(encoding='utf-8', newline='') as handle:
+        if path.suffix.lower() == '.csv':
+            records = list(csv.DictReader(handle))
+        else:
+            records = []
+            for number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError as exc:
+                    raise ValueError(f'{path}: line {number}: {exc}') from None
+                if not isinstance(records[-1], dict):
+                    raise ValueError(f'{path}: line {number}: an entry must be a JSON object')
+
+    jobs = []
+    for index, record in enumerate(records):
+        default_seed = None if base_seed is None else base_seed + index
+        try:
+            jobs.append(_job_from_record(record, default_style, default_seed, default_sizes))
+        except ValueError as exc:
+            raise ValueError(f'{path}: entry {index + 1}: {exc}') from exc
+    return jobs
+
+
+def read_front_matter(path: Path) -> dict[str, str]:
+    """Return the top-level scalar fields of a post's front matter block."""
+    fields: dict[str, str] = {}
+    with path.open(encoding='utf-8') as handle:
+        if handle.readline().strip() != '---':
+            return fields
+        for line in handle:
+            line = line.rstrip('\r\n')
+            if line.strip() == '---':
+                break
+            key, sep, value = line.partition(':')
+            if not sep or not key or key[0].isspace():
+                continue
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] == "'":
+                value = value[1:-1].replace("''", "'")
+            elif len(value) >= 2 and value[0] == value[-1] == '"':
+                value = value[1:-1]
+            fields[key.strip()] = value
+    return fields
+
+
+NON_POST_FILES = ('README.md', 'example_README.md')
+
+
+def iter_post_files(posts_root: Path) -> list[Path]:
+    """Return post Markdown files laid out as ``<year>/<slug>/<file>.md``."""
+    return sorted(path for path in posts_root.glob('*/*/*.md') if path.name not in NON_POST_FILES)
+
+
+def post_cover_path(post: Path, fields: dict[str, str]) -> Path:
+    """Return the cover file a post's ``cover_image`` points at, or ``assets/main.png``.
+
+    Like ``audit_posts.ps1``, only the file name after ``/assets/`` is used,
+    so the cover always lands in the post's own assets folder.
+    """
+    url = fields.get('cover_image', '')
+    _, sep, name = url.rpartition('/assets/')
+    if sep and name and '/' not in name:
+        return post.parent / 'assets' / name
+    return post.parent / 'assets' / 'main.png'
+
+
+def discover_posts(
+    posts_root: Path,
+    default_style: str = 'random',
+    base_seed: int | None = None,
+    default_sizes: tuple[str, ...] = ('cover',),
+) -> list[CoverJob]:
+    """Build cover jobs from the title, description and cover path of every post."""
+    jobs = []
+    for index, post in enumerate(iter_post_files(posts_root)):
+        fields = read_front_matter(post)
+        title = fields.get('title', '')
+        if not title:
+            continue
+        jobs.append(
+            CoverJob(
+                title=title,
+                subtitle=fields.get('description', ''),
+                output=post_cover_path(post, fields),
+                style=default_style,
+                seed=None if base_seed is None else base_seed + index,
+                sizes=default_sizes,
+                post=post,
+            )
+        )
+    return jobs
+
+
+def git_changed_posts(posts_root: Path, base_ref: str = 'HEAD') -> set[Path]:
+    """Return the post files ``git diff`` reports as added, copied, modified or renamed.
+
+    Mirrors ``audit_posts.ps1 -ChangedOnly``: against ``HEAD`` this is the
+    working tree, otherwise everything changed on this branch since ``base_ref``.
+    """
+    root = subprocess.run(
+        ['git', 'rev-parse', '--show-toplevel'],
+        cwd=posts_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    revision = 'HEAD' if base_ref == 'HEAD' else f'{base_ref}...HEAD'
+    changed = subprocess.run(
+        ['git', 'diff', '--name-only', '--diff-filter=ACMR', revision, '--', '*.md'],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+    return {(Path(root) / name).resolve() for name in changed if name.strip()}
+
+
+BUILD_MANIFEST_NAME = 'cover-manifest.json'
+BUILD_MANIFEST_VERSION = 1
+
+
+def stable_seed(key: str, base_seed: int | None = None) -> int:
+    """Derive a seed from ``key`` that stays the same as posts are added or removed."""
+    digest = hashlib.sha256(f'{base_seed}:{key}'.encode()).digest()
+    return int.from_bytes(digest[:4], 'big')
+
+
+def job_input_hash(job: CoverJob, options: RenderOptions, base: Path) -> str:
+    """Hash everything a job's output depends on apart from the renderer itself."""
+    return RenderCache.key(
+        title=job.title,
+        subtitle=job.subtitle,
+        style=job.style,
+        seed=job.seed,
+        sizes=list(job.sizes),
+        output=_relative_key(job.output, base),
+        blur_quality=options.blur_quality,
+        compositing=options.compositing,
+        encoding=options.encoding,
+    )
+
+
+def _relative_key(path: Path, base: Path) -> str:
+    return os.path.relpath(path.resolve(), base.resolve()).replace(os.sep, '/')
+
+
+def load_build_manifest(path: Path) -> dict[str, dict]:
+    """Return the covers recorded by earlier incremental builds, keyed by post."""
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return {}
+    if data.get('version') != BUILD_MANIFEST_VERSION:
+        raise ValueError(f'{path} was written by an incompatible version of this script')
+    return data.get('covers', {})
+
+
+def save_build_manifest(path: Path, covers: dict[str, dict]) -> None:
+    payload = {'version': BUILD_MANIFEST_VERSION, 'covers': dict(sorted(covers.items()))}
+    temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    temp_path.write_text(json.dumps(payload, indent=2) + '\n', encoding='utf-8')
+    os.replace(temp_path, path)
+
+
+@dataclass
+class BuildPlan:
+    """Which post covers an incremental build renders and why the rest are skipped."""
+
+    jobs: list[CoverJob]
+    hashes: dict[str, str]
+    up_to_date: int = 0
+    unmanaged: int = 0
+
+
+def plan_incremental(
+    jobs: list[CoverJob],
+    covers: dict[str, dict],
+    options: RenderOptions,
+    base: Path,
+    base_seed: int | None = None,
+    force: bool = False,
+) -> BuildPlan:
+    """Keep only the jobs whose inputs changed since the manifest or whose outputs are missing.
+
+    Posts already in the manifest keep their recorded style and seed, so a
+    changed title only redraws the text over the same background. New posts
+    get a seed derived from their path. A cover that exists but was not made
+    by a build is treated as hand-made and left alone unless ``force`` is set.
+    """
+    plan = BuildPlan(jobs=[], hashes={})
+    for job in jobs:
+        key = _relative_key(job.post, base)
+        entry = covers.get(key)
+        if entry is not None and not force:
+            job = replace(job, style=entry['requested_style'], seed=entry['seed'])
+        else:
+            job = replace(job, seed=stable_seed(key, base_seed))
+        outputs = [output_path_for(job.output, name) for name in job.sizes]
+        input_hash = job_input_hash(job, options, base)
+        if not force:
+            if entry is None and any(path.exists() for path in outputs):
+                plan.unmanaged += 1
+                continue
+            if entry is not None and entry['hash'] == input_hash and all(path.exists() for path in outputs):
+                plan.up_to_date += 1
+                continue
+        plan.jobs.append(job)
+        plan.hashes[key] = input_hash
+    return plan
+
+
+def record_build(covers: dict[str, dict], plan: BuildPlan, results: list[tuple[CoverJob, RenderResult]], base: Path) -> None:
+    """Record every cover the build rendered in the manifest entries ``covers``."""
+    for job, result in results:
+        key = _relative_key(job.post, base)
+        covers[key] = {
+            'hash': plan.hashes[key],
+            'style': result.style,
+            'requested_style': job.style,
+            'seed': job.seed,
+            'outputs': [_relative_key(image.path, base) for image in result.images],
+        }
+
+
+def describe_saved(image: SavedImage) -> str:
+    """Summarise an output file's size and encode cost for progress output."""
+    cost = 'from cache' if image.cached else f'encoded in {image.seconds * 1000:.0f} ms'
+    return f'{image.bytes / 1024:.0f} KB, {cost}'
+
+
+def print_profiles(profiles: dict[str, dict], fmt: str) -> None:
+    """Write per-style profiles to stderr as text tables or one JSON document."""
+    if fmt == 'json':
+        print(json.dumps({'styles': profiles}, indent=2), file=sys.stderr)
+        return
+    for style in sorted(profiles):
+        print(format_profile(style, profiles[style]), file=sys.stderr)
+
+
+def _render_job(
+    job: CoverJob,
+    options: RenderOptions,
+    cache: RenderCache | None,
+    profile: bool = False,
+) -> tuple[RenderResult, float, dict | None]:
+    started = time.perf_counter()
+    with profiling() if profile else contextlib.nullcontext() as profiler:
+        with profile_span('cover'):
+            result = generate_cover(job.title, job.subtitle, job.output, job.style, job.seed, options, cache, job.sizes)
+    snapshot = profiler.snapshot() if profiler is not None else None
+    return result, time.perf_counter() - started, snapshot
+
+
+def _render_job_in_memory(
+    job: CoverJob,
+    options: RenderOptions,
+    cache: RenderCache | None,
+    profile: bool = False,
+) -> tuple[str, dict[str, EncodedImage], float, dict | None]:
+    """Like :func:`_render_job`, but encode in ``job.output``'s format without writing files."""
+    started = time.perf_counter()
+    with profiling() if profile else contextlib.nullcontext() as profiler:
+        with profile_span('cover'):
+            style, encoded = render_encoded(
+                job.title, job.subtitle, job.style, job.seed, options, job.sizes, image_format(job.output), cache
+            )
+    snapshot = profiler.snapshot() if profiler is not None else None
+    return style, encoded, time.perf_counter() - started, snapshot
+
+
+def run_batch(
+    jobs: list[CoverJob],
+    workers: int,
+    options: RenderOptions | None = None,
+    cache: RenderCache | None = None,
+    profile: str | None = None,
+) -> tuple[list[tuple[CoverJob, RenderResult]], list[tuple[CoverJob, str]]]:
+    """Render ``jobs`` on a process pool and return the ``(job, result)`` successes and ``(job, error)`` failures.
+
+    With ``profile`` set to ``text`` or ``json``, stage timings are aggregated
+    per style and written to stderr at the end.
+    """
+    options = options or RenderOptions()
+    completed: list[tuple[CoverJob, RenderResult]] = []
+    failures: list[tuple[CoverJob, str]] = []
+    saved: list[SavedImage] = []
+    profiles: dict[str, dict] = {}
+
+    def report(job: CoverJob, outcome: tuple[RenderResult, float, dict | None]) -> None:
+        result, elapsed, snapshot = outcome
+        completed.append((job, result))
+        saved.extend(result.images)
+        if snapshot is not None:
+            merge_profile(profiles.setdefault(result.style, {}), snapshot)
+        for image in result.images:
+            print(f'Saved creative cover -> {image.path} style={result.style} ({elapsed:.2f}s, {describe_saved(image)})')
+
+    def summarise() -> None:
+        encoded = [image for image in saved if not image.cached]
+        print(
+            f'Wrote {len(saved)} file(s), {sum(image.bytes for image in saved) / 1024 / 1024:.1f} MB; '
+            f'encoded {len(encoded)} in {sum(image.seconds for image in encoded):.1f}s'
+        )
+        if profile is not None:
+            print_profiles(profiles, profile)
+
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            try:
+                report(job, _render_job(job, options, cache, profile is not None))
+            except Exception as exc:  # keep rendering the rest of the batch
+                failures.append((job, f'{type(exc).__name__}: {exc}'))
+        summarise()
+        return completed, failures
+
+    # Build the on-disk font index once so workers only have to load it.
+    font_index()
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = {pool.submit(_render_job, job, options, cache, profile is not None): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                report(job, future.result())
+            except Exception as exc:  # keep rendering the rest of the batch
+                failures.append((job, f'{type(exc).__name__}: {exc}'))
+    summarise()
+    return completed, failures
+
+
+DEFAULT_SERVER_PORT = 8765
+DEFAULT_SERVER_QUEUE = 16
+# Server requests may only write covers below the working directory or the posts folder.
+POSTS_DIR = Path(__file__).resolve().parent.parent / 'posts'
+
+
+def _warm_worker() -> None:
+    """Load the font index and the default title and subtitle fonts once per server or contact-sheet worker."""
+    font_index()
+    for size in (52, 36, 22):
+        find_font(size)
+
+
+def _serve_request(record: dict, options: RenderOptions, cache: RenderCache | None, profile: bool) -> dict:
+    """Render one server request in a worker and describe the files it produced.
+
+    Requests use the manifest fields. Without ``output`` the cover is encoded
+    in memory in ``format`` (default png) and returned base64-encoded.
+    """
+    if record.get('output'):
+        job = _job_from_record(record, 'random', None, ('cover',))
+        result, elapsed, snapshot = _render_job(job, options, cache, profile)
+        style = result.style
+        files = [
+            {
+                'path': str(image.path),
+                'size': list(image.size),
+                'bytes': image.bytes,
+                'encode_seconds': image.seconds,
+                'cached': image.cached,
+            }
+            for image in result.images
+        ]
+    else:
+        suffix = f'.{record.get("format") or "png"}'
+        if suffix not in IMAGE_FORMATS:
+            raise ValueError(f'Unknown format {suffix[1:]!r}: use one of {", ".join(s[1:] for s in IMAGE_FORMATS)}')
+        job = _job_from_record({**record, 'output': f'cover{suffix}'}, 'random', None, ('cover',))
+        style, encoded, elapsed, snapshot = _render_job_in_memory(job, options, cache, profile)
+        files = [
+            {
+                'name': output_path_for(job.output, name).name,
+                'size': list(image.size),
+                'bytes': len(image.data),
+                'encode_seconds': image.seconds,
+                'cached': image.cached,
+                'data': base64.b64encode(image.data).decode('ascii'),
+            }
+            for name, image in encoded.items()
+        ]
+    response = {'ok': True, 'style': style, 'seconds': elapsed, 'files': files}
+    if snapshot is not None:
+        response['profile'] = snapshot
+    return response
+
+
+class RenderServer:
+    """A bounded pool of warm render workers shared by the stdin and HTTP front ends.
+
+    At most ``workers + queue_size`` requests are in flight; further requests
+    wait (stdin) or are refused (HTTP) until a slot frees up.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        options: RenderOptions,
+        cache: RenderCache | None,
+        profile: bool = False,
+    ) -> None:
+        self.options = options
+        self.cache = cache
+        self.profile = profile
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        # Build the on-disk font index once so workers only have to load it.
+        font_index()
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker)
+
+    def submit(self, record: dict, block: bool = True) -> Future | None:
+        """Queue a render, or return None when ``block`` is false and the queue is full."""
+        if not self.slots.acquire(blocking=block):
+            return None
+        future = self.pool.submit(_serve_request, record, self.options, self.cache, self.profile)
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    @staticmethod
+    def response(record: dict, future: Future) -> dict:
+        try:
+            response = future.result()
+        except Exception as exc:  # report the failure and keep serving
+            response = {'ok': False, 'error': f'{type(exc).__name__}: {exc}'}
+        if 'id' in record:
+            response = {'id': record['id'], **response}
+        return response
+
+    def close(self) -> None:
+        self.pool.shutdown()
+
+
+def _parse_request(text: str) -> dict:
+    record = json.loads(text)
+    if not isinstance(record, dict):
+        raise ValueError('a render request must be a JSON object')
+    output = record.get('output')
+    if output:
+        if not isinstance(output, str):
+            raise ValueError('"output" must be a path string')
+        target = Path(output).resolve()
+        roots = (Path.cwd().resolve(), POSTS_DIR)
+        if not any(target.is_relative_to(root) for root in roots):
+            raise ValueError(f'"output" must be inside {roots[0]} or {roots[1]}, not {output}')
+    # Report a missing title or a bad seed to the client now rather than as a failed render.
+    _job_from_record({**record, 'output': output or 'cover.png'}, 'random', None, ('cover',))
+    return record
+
+
+def serve_stdin(server: RenderServer) -> None:
+    """Read one JSON request per line from stdin and write one JSON response line per request.
+
+    Responses are written as renders finish, so they can arrive out of order;
+    give requests an ``id`` to match them up.
+    """
+    lock = threading.Lock()
+
+    def write(response: dict) -> None:
+        with lock:
+            sys.stdout.write(json.dumps(response) + '\n')
+            sys.stdout.flush()
+
+    try:
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            try:
+                record = _parse_request(line)
+            except ValueError as exc:
+                write({'ok': False, 'error': f'Invalid request: {exc}'})
+                continue
+            future = server.submit(record)
+            future.add_done_callback(lambda done, record=record: write(server.response(record, done)))
+    finally:
+        server.close()
+
+
+def serve_http(server: RenderServer, port: int) -> None:
+    """Serve ``POST /render`` and ``GET /health`` on localhost until interrupted."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if self.path != '/health':
+                self._send(404, {'ok': False, 'error': 'not found'})
+                return
+            self._send(200, {'ok': True})
+
+        def do_POST(self) -> None:
+            if self.path != '/render':
+                self._send(404, {'ok': False, 'error': 'not found'})
+                return
+            # Browsers send cross-origin text/plain and form posts without a preflight; only accept JSON.
+            if self.headers.get_content_type() != 'application/json':
+                self._send(415, {'ok': False, 'error': 'send the request as Content-Type: application/json'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                record = _parse_request(self.rfile.read(length).decode('utf-8'))
+            except ValueError as exc:
+                self._send(400, {'ok': False, 'error': f'Invalid request: {exc}'})
+                return
+            future = server.submit(record, block=False)
+            if future is None:
+                self._send(503, {'ok': False, 'error': 'render queue is full'})
+                return
+            response = server.response(record, future)
+            self._send(200 if response['ok'] else 500, response)
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    print(f'Serving covers on http://127.0.0.1:{httpd.server_port}/render', file=sys.stderr)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        server.close()
+
+
+def print_styles() -> None:
+    """Print every registered style, its weight and its chance of a random pick."""
+    total = sum(style.weight for style in STYLE_REGISTRY.values()) or 1
+    print(f'{"style":<20} {"weight":>6} {"chance":>7}  description')
+    for style in STYLE_REGISTRY.values():
+        flags = ''.join(f' ({flag})' for flag, on in (('flat', style.flat), ('animated', style.animated)) if on)
+        print(f'{style.name:<20} {style.weight:>6g} {style.weight / total:>7.0%}  {style.description}{flags}')
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description='Generate creative cover image with random style by default')
-    parser.add_argument('--title', required=True, help='Title text')
+    parser.add_argument(
+        '--list-styles',
+        action='store_true',
+        help='List the registered styles with their random-pick weights and exit',
+    )
+    parser.add_argument('--title', help='Title text')
     parser.add_argument('--subtitle', default='', help='Subtitle text')
-    parser.add_argument('--output', required=True, help='Output path for the image')
+    parser.add_argument('--output', help='Output path for the image, or - to write it to stdout')
     parser.add_argument(
         '--style',
         default='random',
         choices=('random',) + STYLES,
-        help='Cover style. Defaults to random.',
+        help='Cover style. Defaults to random. In batch mode, used for entries without a style.',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Optional random seed for repeatable output. In batch mode, entry N without a seed uses SEED + N.',
+    )
+    parser.add_argument(
+        '--blur-quality',
+        default=DEFAULT_BLUR_QUALITY,
+        choices=tuple(BLUR_QUALITY_FACTORS),
+        help=f'Resolution for large soft blurs: exact, high (half) or fast (quarter). Defaults to {DEFAULT_BLUR_QUALITY}.',
+    )
+    parser.add_argument(
+        '--compositing',
+        default=DEFAULT_COMPOSITING,
+        choices=COMPOSITING_MODES,
+        help=(
+            'Blend background layers in a float32 buffer rounded once (float), or on the 8-bit canvas, '
+            f'which is lighter on memory (8bit). Defaults to {DEFAULT_COMPOSITING}.'
+        ),
+    )
+    parser.add_argument(
+        '--sizes',
+        type=parse_sizes,
+        default=('cover',),
+        help=(
+            f'Comma-separated output sizes rendered from one background: {", ".join(OUTPUT_SIZES)} or WIDTHxHEIGHT. '
+            'Other aspect ratios are letterboxed, or laid out again for the terminal and blueprint styles. '
+            'Sizes other than cover are written next to --output. Defaults to cover.'
+        ),
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='text',
+        choices=('text', 'json'),
+        help=(
+            'Write per-stage timings and counters to stderr, as a table (default) or JSON. Batch runs aggregate per '
+            'style, and animations render their frames in this process so every stage is recorded.'
+        ),
+    )
+    caching = parser.add_argument_group('render cache')
+    caching.add_argument('--no-cache', action='store_true', help='Always re-render, ignoring and not filling the cache')
+    caching.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=None,
+        help='Render cache directory. Defaults to COVER_CACHE_DIR or the per-user cache directory.',
+    )
+    caching.add_argument(
+        '--cache-size',
+        type=int,
+        default=DEFAULT_CACHE_SIZE_MB,
+        metavar='MB',
+        help=f'Evict least recently used renders above this size. Defaults to {DEFAULT_CACHE_SIZE_MB} MB.',
+    )
+    encoding = parser.add_argument_group('encoding')
+    encoding.add_argument(
+        '--format',
+        choices=tuple(suffix[1:] for suffix in IMAGE_FORMATS),
+        default=None,
+        help='Output format; replaces the suffix of every output path. Defaults to the --output suffix.',
+    )
+    encoding.add_argument(
+        '--compress-level',
+        type=int,
+        default=EncodeOptions.compress_level,
+        choices=range(10),
+        metavar='0-9',
+        help='PNG zlib level: lower encodes faster, higher writes smaller files. Defaults to 6.',
+    )
+    encoding.add_argument('--optimize', action='store_true', help='Let PNG search for the smallest encoding (slow)')
+    encoding.add_argument(
+        '--quality',
+        type=int,
+        default=EncodeOptions.quality,
+        help='WebP/AVIF/JPEG quality from 0 to 100. Defaults to 90.',
+    )
+    encoding.add_argument('--lossless', action='store_true', help='Write lossless WebP')
+    encoding.add_argument('--keep-alpha', action='store_true', help='Keep the alpha channel even when every pixel is opaque')
+    encoding.add_argument(
+        '--palette',
+        choices=PALETTE_MODES,
+        default=EncodeOptions.palette,
+        help='Quantize PNGs to an adaptive palette: never, flat (styles marked flat in --list-styles) or always.',
+    )
+    encoding.add_argument(
+        '--colors',
+        type=int,
+        default=EncodeOptions.colors,
+        help='Palette size for --palette. Defaults to 256.',
+    )
+    animation = parser.add_argument_group('animation')
+    animation.add_argument(
+        '--frames',
+        type=int,
+        default=None,
+        metavar='N',
+        help=(
+            f'Write a looping animated cover of N frames instead of a still: APNG for .png or .apng, GIF or WebP. '
+            f'Only {", ".join(ANIMATED_STYLES)} animate; {DEFAULT_FRAMES} frames at the default rate loop every 2s.'
+        ),
+    )
+    animation.add_argument(
+        '--fps',
+        type=float,
+        default=DEFAULT_FPS,
+        help=f'Frames per second for --frames. Defaults to {DEFAULT_FPS}.',
+    )
+    sheet = parser.add_argument_group('contact sheet')
+    sheet.add_argument(
+        '--contact-sheet',
+        action='store_true',
+        help=(
+            'Render --title in every --sheet-styles style and --sheet-seeds seed into one labelled sheet at --output, '
+            'writing each cover next to it as <name>-<style>-<seed>'
+        ),
+    )
+    sheet.add_argument(
+        '--sheet-styles',
+        type=lambda value: tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip())),
+        default=STYLES,
+        help='Comma-separated styles for --contact-sheet, one row each. Defaults to every style.',
+    )
+    sheet.add_argument(
+        '--sheet-seeds',
+        type=parse_seeds,
+        default=DEFAULT_SHEET_SEEDS,
+        help=(
+            'Comma-separated seeds for --contact-sheet, one column each. '
+            f'Defaults to {",".join(map(str, DEFAULT_SHEET_SEEDS))}.'
+        ),
+    )
+    sheet.add_argument(
+        '--tile-width',
+        type=int,
+        default=DEFAULT_SHEET_TILE_WIDTH,
+        help=f'Width of each cover on the contact sheet. Defaults to {DEFAULT_SHEET_TILE_WIDTH}.',
+    )
+    batch = parser.add_argument_group('batch mode')
+    source = batch.add_mutually_exclusive_group()
+    source.add_argument('--manifest', type=Path, help='JSONL or CSV manifest of covers to render')
+    source.add_argument(
+        '--from-posts',
+        type=Path,
+        nargs='?',
+        const=Path('posts'),
+        metavar='DIR',
+        help='Render assets/main.png for every post under DIR (default: posts) from its title and description',
+    )
+    batch.add_argument(
+        '--changed-only',
+        action='store_true',
+        help='With --from-posts, only consider posts git diff reports as changed, like audit_posts.ps1 -ChangedOnly',
+    )
+    batch.add_argument(
+        '--base-ref',
+        default='HEAD',
+        help='Git ref for --changed-only: HEAD compares the working tree, other refs compare REF...HEAD. Defaults to HEAD.',
+    )
+    batch.add_argument(
+        '--incremental',
+        action='store_true',
+        help=(
+            'With --from-posts, only render covers whose front matter or render settings changed since the last '
+            'build, or whose files are missing. Covers the build did not make are left alone.'
+        ),
+    )
+    batch.add_argument(
+        '--build-manifest',
+        type=Path,
+        metavar='PATH',
+        help=f'Where --incremental records what it rendered. Defaults to {BUILD_MANIFEST_NAME} in the posts folder.',
+    )
+    batch.add_argument(
+        '--force',
+        action='store_true',
+        help='With --incremental, re-render every selected post, replacing hand-made covers too',
+    )
+    batch.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of worker processes for batch mode, server mode and animation frames. Defaults to the CPU count.',
+    )
+    server = parser.add_argument_group('server mode')
+    server.add_argument(
+        '--serve',
+        choices=('stdin', 'http'),
+        help='Stay resident and render JSON requests from stdin (one per line) or POST /render on localhost',
+    )
+    server.add_argument(
+        '--port',
+        type=int,
+        default=DEFAULT_SERVER_PORT,
+        help=f'Port for --serve http on 127.0.0.1. Defaults to {DEFAULT_SERVER_PORT}.',
+    )
+    server.add_argument(
+        '--queue-size',
+        type=int,
+        default=DEFAULT_SERVER_QUEUE,
+        help=f'Requests allowed to wait for a worker in server mode. Defaults to {DEFAULT_SERVER_QUEUE}.',
     )
-    parser.add_argument('--seed', type=int, default=None, help='Optional random seed for repeatable output')
 
     args = parser.parse_args()
+    if args.list_styles:
+        print_styles()
+        return
+
+    if not 0 <= args.quality <= 100:
+        parser.error('--quality must be between 0 and 100')
+    if not 2 <= args.colors <= 256:
+        parser.error('--colors must be between 2 and 256')
+    encode_options = EncodeOptions(
+        compress_level=args.compress_level,
+        optimize=args.optimize,
+        quality=args.quality,
+        lossless=args.lossless,
+        flatten=not args.keep_alpha,
+        palette=args.palette,
+        colors=args.colors,
+    )
+    options = RenderOptions(blur_quality=args.blur_quality, compositing=args.compositing, encoding=encode_options)
+    cache = None
+    if not args.no_cache:
+        cache = RenderCache(args.cache_dir or default_cache_dir(), args.cache_size * 1024 * 1024)
+
+    if args.serve is not None:
+        if args.manifest is not None or args.from_posts is not None:
+            parser.error('--serve cannot be combined with --manifest or --from-posts')
+        if args.workers < 1 or args.queue_size < 0:
+            parser.error('--workers must be at least 1 and --queue-size cannot be negative')
+        render_server = RenderServer(args.workers, args.queue_size, options, cache, args.profile is not None)
+        if args.serve == 'stdin':
+            serve_stdin(render_server)
+        else:
+            serve_http(render_server, args.port)
+        return
+
+    if args.contact_sheet:
+        if args.manifest is not None or args.from_posts is not None or args.frames is not None:
+            parser.error('--contact-sheet cannot be combined with --manifest, --from-posts or --frames')
+        if not args.title or not args.output or args.output == '-':
+            parser.error('--contact-sheet needs --title and an --output file')
+        unknown = [style for style in args.sheet_styles if style not in STYLES]
+        if unknown:
+            parser.error(f'Unknown style(s) for --sheet-styles: {", ".join(unknown)}')
+        if not args.sheet_styles or not args.sheet_seeds or args.tile_width < 16:
+            parser.error('--contact-sheet needs at least one style and seed and a --tile-width of 16 or more')
+        if len(args.sizes) != 1:
+            parser.error('--contact-sheet renders one size; pass a single --sizes entry')
+        output_path = Path(args.output)
+        if args.format is not None:
+            output_path = output_path.with_suffix(f'.{args.format}')
+        try:
+            image_format(output_path)
+            parse_output_size(args.sizes[0])
+        except ValueError as exc:
+            parser.error(str(exc))
+        image, results = render_contact_sheet(
+            args.title,
+            args.subtitle,
+            output_path,
+            args.sheet_styles,
+            args.sheet_seeds,
+            options,
+            args.sizes[0],
+            args.tile_width,
+            args.workers,
+            cache,
+            args.profile,
+        )
+        width, height = image.size
+        covers = sum(len(result.images) for result in results)
+        print(
+            f'Saved contact sheet -> {image.path} ({width}x{height}, {len(results)} style(s) x '
+            f'{len(args.sheet_seeds)} seed(s)), {covers} covers in {image.seconds:.1f}s'
+        )
+        return
+
+    if args.frames is not None:
+        if args.manifest is not None or args.from_posts is not None:
+            parser.error('--frames cannot be combined with --manifest or --from-posts')
+        if not args.title or not args.output or args.output == '-':
+            parser.error('--frames needs --title and an --output file')
+        if args.frames < 1 or args.fps <= 0:
+            parser.error('--frames must be at least 1 and --fps positive')
+        if len(args.sizes) != 1:
+            parser.error('--frames writes one animation; pass a single --sizes entry')
+        if args.style != 'random' and args.style not in ANIMATED_STYLES:
+            parser.error(f'{args.style} does not animate; use one of {", ".join(ANIMATED_STYLES)}')
+        output_path = Path(args.output)
+        if args.format is not None:
+            output_path = output_path.with_suffix(f'.{args.format}')
+        try:
+            animation_format(output_path)
+            parse_output_size(args.sizes[0])
+        except ValueError as exc:
+            parser.error(str(exc))
+        workers = 1 if args.profile is not None else args.workers
+        with profiling() if args.profile is not None else contextlib.nullcontext() as profiler:
+            result = render_animation(
+                args.title,
+                args.subtitle,
+                output_path,
+                args.style,
+                args.seed,
+                options,
+                args.frames,
+                args.fps,
+                args.sizes[0],
+                workers,
+            )
+        image = result.images[0]
+        width, height = image.size
+        print(
+            f'Saved animated cover -> {image.path} ({width}x{height}, {args.frames} frames at {args.fps:g} fps), '
+            f'style={result.style}, {image.bytes / 1024:.0f} KB in {image.seconds:.1f}s'
+        )
+        if profiler is not None:
+            print_profiles({result.style: merge_profile({}, profiler.snapshot())}, args.profile)
+        return
+
+    if args.from_posts is None and (args.incremental or args.changed_only):
+        parser.error('--incremental and --changed-only need --from-posts')
+    if args.force and not args.incremental:
+        parser.error('--force needs --incremental')
+
+    if args.manifest is not None or args.from_posts is not None:
+        try:
+            if args.manifest is not None:
+                jobs = load_manifest(args.manifest, args.style, args.seed, args.sizes)
+            else:
+                jobs = discover_posts(args.from_posts, args.style, args.seed, args.sizes)
+        except (OSError, ValueError) as exc:
+            parser.error(str(exc))
+        if args.format is not None:
+            jobs = [replace(job, output=job.output.with_suffix(f'.{args.format}')) for job in jobs]
+        for job in jobs:
+            if job.style != 'random' and job.style not in STYLES:
+                parser.error(f'Unknown style {job.style!r} for {job.output}')
+            try:
+                for name in job.sizes:
+                    parse_output_size(name)
+            except ValueError as exc:
+                parser.error(f'{exc} for {job.output}')
+
+        if args.changed_only:
+            try:
+                changed = git_changed_posts(args.from_posts, args.base_ref)
+            except (OSError, subprocess.CalledProcessError) as exc:
+                parser.error(f'--changed-only could not ask git for changed posts: {exc}')
+            jobs = [job for job in jobs if job.post.resolve() in changed]
+
+        if args.incremental:
+            build_manifest = args.build_manifest or args.from_posts / BUILD_MANIFEST_NAME
+            try:
+                covers = load_build_manifest(build_manifest)
+            except ValueError as exc:
+                parser.error(str(exc))
+            plan = plan_incremental(jobs, covers, options, build_manifest.parent, args.seed, args.force)
+            skipped = f', {plan.unmanaged} hand-made left alone (--force replaces them)' if plan.unmanaged else ''
+            print(f'{len(plan.jobs)} cover(s) to render, {plan.up_to_date} up to date{skipped}')
+            if not plan.jobs:
+                return
+            jobs = plan.jobs
+
+        started = time.perf_counter()
+        completed, failures = run_batch(jobs, args.workers, options, cache, args.profile)
+        elapsed = time.perf_counter() - started
+        if args.incremental:
+            record_build(covers, plan, completed, build_manifest.parent)
+            save_build_manifest(build_manifest, covers)
+        print(f'Rendered {len(jobs) - len(failures)}/{len(jobs)} covers in {elapsed:.1f}s with {args.workers} worker(s)')
+        if failures:
+            print(f'{len(failures)} cover(s) failed:', file=sys.stderr)
+            for job, error in failures:
+                print(f'  - {job.output}: {error}', file=sys.stderr)
+            raise SystemExit(1)
+        return
+
+    if not args.title or not args.output:
+        parser.error('--title and --output are required unless --manifest or --from-posts is given')
+
+    try:
+        for name in args.sizes:
+            parse_output_size(name)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if args.output == '-':
+        if len(args.sizes) != 1:
+            parser.error('--output - writes one image; pass a single --sizes entry')
+        job = CoverJob(args.title, args.subtitle, Path(f'cover.{args.format or "png"}'), args.style, args.seed, args.sizes)
+        style, encoded, _, snapshot = _render_job_in_memory(job, options, cache, args.profile is not None)
+        image = encoded[args.sizes[0]]
+        sys.stdout.buffer.write(image.data)
+        sys.stdout.flush()
+        width, height = image.size
+        cost = 'from cache' if image.cached else f'encoded in {image.seconds * 1000:.0f} ms'
+        print(f'Wrote creative cover to stdout ({width}x{height}), style={style}, {len(image.data) / 1024:.0f} KB, {cost}', file=sys.stderr)
+        if snapshot is not None:
+            print_profiles({style: merge_profile({}, snapshot)}, args.profile)
+        return
+
     output_path = Path(args.output)
-    used_style = generate_cover(args.title, args.subtitle, output_path, args.style, args.seed)
-    print(f'Saved creative cover -> {output_path} ({WIDTH}x{HEIGHT}), style={used_style}')
+    if args.format is not None:
+        output_path = output_path.with_suffix(f'.{args.format}')
+    try:
+        image_format(output_path)
+    except ValueError as exc:
+        parser.error(str(exc))
+    job = CoverJob(args.title, args.subtitle, output_path, args.style, args.seed, args.sizes)
+    result, _, snapshot = _render_job(job, options, cache, args.profile is not None)
+    for image in result.images:
+        width, height = image.size
+        print(f'Saved creative cover -> {image.path} ({width}x{height}), style={result.style}, {describe_saved(image)}')
+    if snapshot is not None:
+        print_profiles({result.style: merge_profile({}, snapshot)}, args.profile)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""Find heavy, duplicated and stale images under posts/ and shrink them losslessly.
+
+Every image is hashed in a process pool: a SHA-256 of its bytes finds exact
+copies and a 64-bit difference hash of its pixels finds near-duplicates, such
+as the same screenshot saved twice or a cover re-exported at another size.
+The report lists the heaviest posts, both kinds of duplicates, files whose
+content does not match their suffix and the ``*.bak-*`` backups left next to
+assets.
+
+--optimize re-encodes PNGs in place and keeps a result only when it decodes
+to exactly the same pixels and is smaller. Candidates are an optimized
+re-save, a palette version when the image has 256 colours or fewer, and RGB
+when the alpha channel is fully opaque. Colour (gAMA, sRGB, cHRM, iCCP),
+resolution (pHYs) and text chunks are written back. File names and formats
+stay the same, so post links keep working. Add --dry-run to see the savings without writing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageChops, PngImagePlugin
+except ImportError:
+    raise SystemExit('Pillow is required: python -m pip install pillow') from None
+
+EXPECTED_FORMATS = {'.png': 'PNG', '.gif': 'GIF', '.jpg': 'JPEG', '.jpeg': 'JPEG', '.webp': 'WEBP'}
+BACKUP_MARKER = '.bak-'
+DEFAULT_DISTANCE = 4
+DEFAULT_TOP = 15
+# Ancillary PNG chunks copied into a re-encoded file; iCCP and pHYs go through icc_profile and dpi.
+KEPT_CHUNKS = (b'cHRM', b'cICP', b'gAMA', b'sRGB', b'tIME', b'tEXt', b'zTXt', b'iTXt')
+
+
+@dataclass(frozen=True)
+class Asset:
+    """One image file and its hashes."""
+
+    path: str
+    bytes: int
+    format: str | None
+    size: tuple[int, int] | None
+    sha256: str
+    dhash: int | None
+
+
+@dataclass(frozen=True)
+class Recompressed:
+    """The outcome of losslessly re-encoding one PNG."""
+
+    path: str
+    before: int
+    after: int
+    format: str
+    mode: str
+
+
+def difference_hash(img: Image.Image) -> int:
+    """Return a 64-bit dHash: whether each pixel of a 9x8 greyscale thumbnail is brighter than its right neighbour."""
+    if img.mode in ('P', 'PA') or 'transparency' in img.info:
+        img = img.convert('RGBA')
+    pixels = img.convert('L').resize((9, 8), Image.LANCZOS).tobytes()
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = bits << 1 | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return bits
+
+
+def scan_asset(path: Path) -> Asset:
+    data = path.read_bytes()
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            fmt, size, dhash = img.format, img.size, difference_hash(img)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        fmt, size, dhash = None, None, None
+    return Asset(path.as_posix(), len(data), fmt, size, hashlib.sha256(data).hexdigest(), dhash)
+
+
+def _same_pixels(a: Image.Image, b: Image.Image) -> bool:
+    mode = 'RGBA' if 'A' in a.getbands() or 'transparency' in a.info else 'RGB'
+    a, b = a.convert(mode), b.convert(mode)
+    return a.size == b.size and ImageChops.difference(a, b).getbbox() is None
+
+
+def png_metadata(data: bytes) -> PngImagePlugin.PngInfo:
+    """Collect the colour and text chunks of a PNG so a re-encode can write them back."""
+    info = PngImagePlugin.PngInfo()
+    offset = 8
+    while offset + 8 <= len(data):
+        length = int.from_bytes(data[offset:offset + 4], 'big')
+        cid = data[offset + 4:offset + 8]
+        if cid == b'IEND':
+            break
+        if cid in KEPT_CHUNKS:
+            info.add(cid, data[offset + 8:offset + 8 + length])
+        offset += 12 + length
+    return info
+
+
+def recompress_png(path: Path, write: bool) -> Recompressed | None:
+    """Re-encode ``path`` losslessly and keep the smallest result that decodes to the same pixels.
+
+    Files named .png that hold another format, such as BMP screenshots, are
+    rewritten as real PNGs. 16-bit PNGs are skipped because Pillow decodes
+    them to 8 bits per channel.
+    """
+    data = path.read_bytes()
+    with Image.open(io.BytesIO(data)) as original:
+        if getattr(original, 'is_animated', False):
+            return None
+        if original.format == 'PNG' and data[24] == 16:
+            return None
+        source_format = original.format
+        original.load()
+        icc_profile = original.info.get('icc_profile')
+        dpi = original.info.get('dpi')
+        metadata = png_metadata(data) if source_format == 'PNG' else None
+        candidates = [original]
+        if original.mode == 'RGBA' and original.getextrema()[3] == (255, 255):
+            candidates.append(original.convert('RGB'))
+        if original.mode in ('RGB', 'RGBA') and original.getcolors(256) is not None:
+            candidates.append(original.quantize(256, method=Image.FASTOCTREE if original.mode == 'RGBA' else Image.MEDIANCUT))
+
+        best, best_mode = data, original.mode
+        for candidate in candidates:
+            buffer = io.BytesIO()
+            params = {'optimize': True}
+            if icc_profile:
+                params['icc_profile'] = icc_profile
+            if dpi:
+                params['dpi'] = dpi
+            if metadata is not None and metadata.chunks:
+                params['pnginfo'] = metadata
+            if 'transparency' in candidate.info:
+                params['transparency'] = candidate.info['transparency']
+            candidate.save(buffer, 'PNG', **params)
+            encoded = buffer.getvalue()
+            if len(encoded) >= len(best):
+                continue
+            with Image.open(io.BytesIO(encoded)) as decoded:
+                if _same_pixels(original, decoded):
+                    best, best_mode = encoded, candidate.mode
+    if len(best) >= len(data):
+        return None
+    if write:
+        temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        temp_path.write_bytes(best)
+        os.replace(temp_path, path)
+    return Recompressed(path.as_posix(), len(data), len(best), source_format, best_mode)
+
+
+def _recompress_job(path: Path, write: bool) -> Recompressed | None:
+    try:
+        return recompress_png(path, write)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+
+def find_assets(root: Path) -> tuple[list[Path], list[Path]]:
+    """Return the images and the ``*.bak-*`` backups under ``root``."""
+    images, backups = [], []
+    for path in sorted(root.rglob('*')):
+        if not path.is_file():
+            continue
+        if BACKUP_MARKER in path.name:
+            backups.append(path)
+        elif path.suffix.lower() in EXPECTED_FORMATS:
+            images.append(path)
+    return images, backups
+
+
+def post_folder(path: str, root: Path) -> str:
+    """Group an asset under its ``<year>/<slug>`` post folder."""
+    parts = Path(path).relative_to(root).parts
+    return '/'.join(parts[:2]) if len(parts) > 2 else parts[0]
+
+
+def exact_duplicates(assets: list[Asset]) -> list[list[Asset]]:
+    groups = defaultdict(list)
+    for asset in assets:
+        groups[asset.sha256].append(asset)
+    return sorted((group for group in groups.values() if len(group) > 1), key=lambda group: -group[0].bytes * (len(group) - 1))
+
+
+def near_duplicates(assets: list[Asset], distance: int) -> list[tuple[Asset, Asset, int]]:
+    """Pair images whose dHashes differ in at most ``distance`` bits, skipping exact copies."""
+    unique = {}
+    for asset in assets:
+        if asset.dhash is not None:
+            unique.setdefault(asset.sha256, asset)
+    hashed = list(unique.values())
+    pairs = []
+    for index, first in enumerate(hashed):
+        for second in hashed[index + 1:]:
+            bits = (first.dhash ^ second.dhash).bit_count()
+            if bits <= distance:
+                pairs.append((first, second, bits))
+    return sorted(pairs, key=lambda pair: (pair[2], pair[0].path))
+
+
+def build_report(root: Path, assets: list[Asset], backups: list[Path], distance: int) -> dict:
+    weights = defaultdict(lambda: [0, 0])
+    for asset in assets:
+        weight = weights[post_folder(asset.path, root)]
+        weight[0] += asset.bytes
+        weight[1] += 1
+    exact = exact_duplicates(assets)
+    return {
+        'images': len(assets),
+        'bytes': sum(asset.bytes for asset in assets),
+        'posts': sorted(
+            ({'post': post, 'bytes': total, 'images': count} for post, (total, count) in weights.items()),
+            key=lambda entry: -entry['bytes'],
+        ),
+        'exact_duplicates': [[asset.path for asset in group] for group in exact],
+        'duplicate_bytes': sum(group[0].bytes * (len(group) - 1) for group in exact),
+        'near_duplicates': [
+            {'paths': [first.path, second.path], 'distance': bits} for first, second, bits in near_duplicates(assets, distance)
+        ],
+        'mislabelled': [
+            {'path': asset.path, 'format': asset.format}
+            for asset in assets
+            if asset.format is not None and EXPECTED_FORMATS[Path(asset.path).suffix.lower()] != asset.format
+        ],
+        'backups': [{'path': path.as_posix(), 'bytes': path.stat().st_size} for path in backups],
+    }
+
+
+def _mb(value: int) -> str:
+    return f'{value / 1024 / 1024:.1f} MB'
+
+
+def print_report(report: dict, top: int) -> None:
+    print(f'{report["images"]} image(s), {_mb(report["bytes"])}')
+    print(f'\nHeaviest posts (top {top}):')
+    for entry in report['posts'][:top]:
+        print(f'  {entry["bytes"] / 1024:>9.0f} KB  {entry["images"]:>3} image(s)  {entry["post"]}')
+
+    print(f'\nExact duplicates: {len(report["exact_duplicates"])} group(s), {_mb(report["duplicate_bytes"])} in extra copies')
+    for group in report['exact_duplicates']:
+        print(f'  - {group[0]}')
+        for path in group[1:]:
+            print(f'    = {path}')
+
+    print(f'\nNear-duplicates: {len(report["near_duplicates"])} pair(s)')
+    for pair in report['near_duplicates']:
+        first, second = pair['paths']
+        print(f'  - {first}\n    ~ {second} ({pair["distance"]} bit(s) apart)')
+
+    print(f'\nWrong format for their suffix: {len(report["mislabelled"])} file(s)')
+    for entry in report['mislabelled']:
+        print(f'  - {entry["path"]} ({entry["format"]})')
+
+    backup_bytes = sum(entry['bytes'] for entry in report['backups'])
+    print(f'\nStale backups: {len(report["backups"])} file(s), {_mb(backup_bytes)}')
+    for entry in report['backups']:
+        print(f'  - {entry["path"]}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Report heavy and duplicate post images and recompress them losslessly')
+    parser.add_argument('root', type=Path, nargs='?', default=Path('posts'), help='Folder to scan. Defaults to posts.')
+    parser.add_argument(
+        '--distance',
+        type=int,
+        default=DEFAULT_DISTANCE,
+        help=f'Largest dHash difference, in bits of 64, reported as a near-duplicate. Defaults to {DEFAULT_DISTANCE}.',
+    )
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help=f'Posts listed by asset weight. Defaults to {DEFAULT_TOP}.')
+    parser.add_argument('--optimize', action='store_true', help='Recompress PNGs in place when it is lossless and smaller')
+    parser.add_argument('--dry-run', action='store_true', help='With --optimize, report the savings without writing files')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of worker processes. Defaults to the CPU count.',
+    )
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON instead of text')
+    args = parser.parse_args()
+
+    if not args.root.is_dir():
+        parser.error(f'{args.root} is not a folder')
+    if args.dry_run and not args.optimize:
+        parser.error('--dry-run needs --optimize')
+
+    images, backups = find_assets(args.root)
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        assets = list(pool.map(scan_asset, images, chunksize=16))
+        recompressed = []
+        if args.optimize:
+            pngs = [path for path in images if path.suffix.lower() == '.png']
+            outcomes = pool.map(_recompress_job, pngs, [not args.dry_run] * len(pngs), chunksize=4)
+            recompressed = [outcome for outcome in outcomes if outcome is not None]
+
+    report = build_report(args.root, assets, backups, args.distance)
+    if args.optimize:
+        report['recompressed'] = [asdict(outcome) for outcome in recompressed]
+        report['recompressed_saving'] = sum(outcome.before - outcome.after for outcome in recompressed)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print_report(report, args.top)
+    if args.optimize:
+        verb = 'Would save' if args.dry_run else 'Saved'
+        print(f'\n{verb} {_mb(report["recompressed_saving"])} by recompressing {len(recompressed)} PNG(s):')
+        for outcome in sorted(recompressed, key=lambda outcome: outcome.after - outcome.before):
+            saving = 1 - outcome.after / outcome.before
+            source = '' if outcome.format == 'PNG' else f' from {outcome.format}'
+            print(
+                f'  - {outcome.path}: {outcome.before / 1024:.0f} -> {outcome.after / 1024:.0f} KB '
+                f'(-{saving:.0%}, {outcome.mode}{source})'
+            )
+
+
+if __name__ == '__main__':
+    main()